@@ -16,7 +16,7 @@ import shutil
 import base64
 from datetime import datetime
 from config import load_settings, save_settings, SETTINGS_FILE, AUTH_FILE
-from device_manager import device_manager
+from device_manager import get_device_manager
 from device_metadata import load_metadata, save_metadata
 from logger import debug, info, warning, error, exception
 
@@ -65,17 +65,13 @@ def create_full_backup(include_database=True):
         debug(f"Loaded settings: {len(settings)} keys")
 
         # Load devices with decrypted API keys
-        devices_list = device_manager.load_devices(decrypt_api_keys=True)
+        devices_list = get_device_manager().load_devices(decrypt_api_keys=True)
         debug(f"Loaded devices: {len(devices_list)} devices")
 
-        # Load full devices data structure to get groups (but use decrypted devices list)
-        with open(device_manager.devices_file, 'r') as f:
-            file_data = json.load(f)
-
         # Build devices_data with decrypted devices + groups from file
         devices_data = {
             'devices': devices_list,  # Use decrypted list
-            'groups': file_data.get('groups', [])
+            'groups': get_device_manager().get_groups()
         }
 
         # Load metadata (get all, regardless of format)
@@ -403,7 +399,7 @@ def restore_from_backup(backup_data, restore_settings=True, restore_devices=True
         if needs_encryption_key and 'encryption_key' in backup_data:
             try:
                 import base64
-                from encryption import KEY_FILE
+                from encryption import KEY_FILE, invalidate_cipher_cache
 
                 # Decode base64 encryption key
                 key_bytes = base64.b64decode(backup_data['encryption_key'])
@@ -416,6 +412,9 @@ def restore_from_backup(backup_data, restore_settings=True, restore_devices=True
                 import os
                 os.chmod(KEY_FILE, 0o600)
 
+                # Drop the cached cipher so later decrypts use the restored key
+                invalidate_cipher_cache()
+
                 result['restored'].append('encryption_key')
                 info("Restored encryption key from backup")
                 debug("Encryption key restored and file permissions set to 600")
@@ -488,14 +487,10 @@ def restore_from_backup(backup_data, restore_settings=True, restore_devices=True
                         warning(f"Device {old_id} has no IP address - keeping original ID")
 
                 # Save devices list with corrected device_ids
-                if device_manager.save_devices(devices_list):
+                if get_device_manager().save_devices(devices_list):
                     # Also restore groups if present in backup
                     if isinstance(devices_data, dict) and 'groups' in devices_data:
-                        with open(device_manager.devices_file, 'r') as f:
-                            full_data = json.load(f)
-                        full_data['groups'] = devices_data['groups']
-                        with open(device_manager.devices_file, 'w') as f:
-                            json.dump(full_data, f, indent=2)
+                        get_device_manager().set_groups(devices_data['groups'])
 
                     # After restoring devices, ensure settings has a valid selected_device_id
                     # Update selected_device_id if it was mapped to a new deterministic ID
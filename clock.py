@@ -6,6 +6,7 @@ Based on Heroku production best practices for scheduled tasks
 import time
 import signal
 import sys
+import threading
 from datetime import datetime
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.events import (
@@ -37,27 +38,33 @@ scheduler_stats = {
     'uptime_seconds': 0,
     'jobs': {}  # Per-job statistics
 }
+# Guards the shared counters above - event listeners fire from the executor's worker threads
+_stats_lock = threading.Lock()
 
 # APScheduler event listeners for comprehensive monitoring
 def on_job_executed(event):
     """Called when a job completes successfully."""
     global scheduler_stats
-    scheduler_stats['total_executions'] += 1
-    scheduler_stats['last_execution'] = datetime.utcnow().isoformat()
-    scheduler_stats['execution_history'].append(datetime.utcnow().isoformat())
-    # Keep only last 10 executions
-    if len(scheduler_stats['execution_history']) > 10:
-        scheduler_stats['execution_history'].pop(0)
-
-    print(f"[CLOCK EVENT] ✓ Job '{event.job_id}' executed successfully at {scheduler_stats['last_execution']}")
-    info("Clock job '%s' executed successfully (total: %d)", event.job_id, scheduler_stats['total_executions'])
+    executed_at = datetime.utcnow().isoformat()
+    with _stats_lock:
+        scheduler_stats['total_executions'] += 1
+        total_executions = scheduler_stats['total_executions']
+        scheduler_stats['last_execution'] = executed_at
+        scheduler_stats['execution_history'].append(executed_at)
+        # Keep only last 10 executions
+        if len(scheduler_stats['execution_history']) > 10:
+            scheduler_stats['execution_history'].pop(0)
+
+    print(f"[CLOCK EVENT] ✓ Job '{event.job_id}' executed successfully at {executed_at}")
+    info("Clock job '%s' executed successfully (total: %d)", event.job_id, total_executions)
 
 def on_job_error(event):
     """Called when a job raises an exception."""
     global scheduler_stats
-    scheduler_stats['total_errors'] += 1
-    scheduler_stats['last_error'] = str(event.exception)
-    scheduler_stats['last_error_time'] = datetime.utcnow().isoformat()
+    with _stats_lock:
+        scheduler_stats['total_errors'] += 1
+        scheduler_stats['last_error'] = str(event.exception)
+        scheduler_stats['last_error_time'] = datetime.utcnow().isoformat()
 
     print(f"[CLOCK EVENT] ✗ Job '{event.job_id}' ERROR: {event.exception}")
     error("Clock job '%s' failed with error: %s", event.job_id, str(event.exception))
@@ -199,7 +206,7 @@ def collect_connected_devices():
 
     try:
         # Import required modules
-        from device_manager import device_manager
+        from device_manager import get_device_manager
         from firewall_api_devices import get_connected_devices
         from firewall_api import get_firewall_config
 
@@ -210,7 +217,7 @@ def collect_connected_devices():
             return
 
         # Get all enabled devices
-        devices = device_manager.load_devices(decrypt_api_keys=False)
+        devices = get_device_manager().load_devices(decrypt_api_keys=False)
         enabled_devices = [d for d in devices if d.get('enabled', True)]
 
         if not enabled_devices:
@@ -307,7 +314,7 @@ def collect_traffic_flows():
 
     try:
         # Import required modules
-        from device_manager import device_manager
+        from device_manager import get_device_manager
 
         collector = get_collector()
         if not collector:
@@ -316,7 +323,7 @@ def collect_traffic_flows():
             return
 
         # Get all enabled devices
-        devices = device_manager.load_devices(decrypt_api_keys=False)
+        devices = get_device_manager().load_devices(decrypt_api_keys=False)
         enabled_devices = [d for d in devices if d.get('enabled', True)]
 
         if not enabled_devices:
@@ -571,8 +578,9 @@ def persist_scheduler_stats():
             uptime = (datetime.utcnow() - clock_start_time).total_seconds()
             scheduler_stats['uptime_seconds'] = int(uptime)
 
-        # Add timestamp
-        stats_to_save = scheduler_stats.copy()
+        # Snapshot under the lock so counters are consistent with each other
+        with _stats_lock:
+            stats_to_save = scheduler_stats.copy()
         stats_to_save['timestamp'] = datetime.utcnow().isoformat()
 
         # Get collector to access storage
@@ -581,7 +589,7 @@ def persist_scheduler_stats():
         if collector and collector.storage:
             # Extract individual parameters from stats dictionary
             # Convert last_execution from ISO string to datetime object if present
-            last_exec = scheduler_stats.get('last_execution')
+            last_exec = stats_to_save.get('last_execution')
             print(f"[PERSIST DEBUG] last_exec (before conversion)={last_exec}, type={type(last_exec)}")
             if last_exec and isinstance(last_exec, str):
                 try:
@@ -593,15 +601,15 @@ def persist_scheduler_stats():
                     last_exec = None
 
             print(f"[PERSIST DEBUG] Calling insert_scheduler_stats with:")
-            print(f"  uptime_seconds={scheduler_stats.get('uptime_seconds', 0)}")
-            print(f"  total_executions={scheduler_stats.get('total_executions', 0)}")
-            print(f"  total_errors={scheduler_stats.get('total_errors', 0)}")
+            print(f"  uptime_seconds={stats_to_save.get('uptime_seconds', 0)}")
+            print(f"  total_executions={stats_to_save.get('total_executions', 0)}")
+            print(f"  total_errors={stats_to_save.get('total_errors', 0)}")
             print(f"  last_execution={last_exec}")
 
             success = collector.storage.insert_scheduler_stats(
-                uptime_seconds=scheduler_stats.get('uptime_seconds', 0),
-                total_executions=scheduler_stats.get('total_executions', 0),
-                total_errors=scheduler_stats.get('total_errors', 0),
+                uptime_seconds=stats_to_save.get('uptime_seconds', 0),
+                total_executions=stats_to_save.get('total_executions', 0),
+                total_errors=stats_to_save.get('total_errors', 0),
                 last_execution=last_exec
             )
             print(f"[PERSIST DEBUG] insert_scheduler_stats returned: {success}")
@@ -796,9 +804,8 @@ def process_collection_queue():
 
 def main():
     """Main clock process entry point."""
-    print("=" * 60)
-    print("PANfm Clock Process Starting...")
-    print("=" * 60)
+    banner = "=" * 60
+    print(f"{banner}\nPANfm Clock Process Starting...\n{banner}")
 
     # Load settings
     settings = load_settings()
@@ -974,9 +981,7 @@ def main():
     clock_start_time = datetime.utcnow()
     scheduler_stats['state'] = 'running'
 
-    print("=" * 60)
-    print("Clock process initialized successfully")
-    print("=" * 60)
+    print(f"{banner}\nClock process initialized successfully\n{banner}")
 
     # Run initial collections immediately before starting scheduler
     print("[CLOCK INIT] Running initial data collection...")
@@ -1015,14 +1020,18 @@ def main():
         print(f"[CLOCK INIT] ⚠ Initial analytics collection failed: {str(e)}")
         # Continue anyway - scheduler will retry in 5 minutes
 
-    print("=" * 60)
-    print(f"Initial collections complete - dashboard data available immediately")
-    print(f"Recurring schedule:")
-    print(f"  - Throughput collection: every {refresh_interval}s")
-    print(f"  - Traffic flows: every 60s")
-    print(f"  - Log collection: every 300s (5 min)")
-    print(f"  - Analytics collection: every 300s (5 min)")
-    print("=" * 60)
+    # Single write for the schedule summary (one stdout write instead of one per line)
+    print("\n".join([
+        banner,
+        "Initial collections complete - dashboard data available immediately",
+        "Recurring schedule:",
+        f"  - Throughput collection: every {refresh_interval}s",
+        "  - Traffic flows: every 60s",
+        "  - Log collection: every 300s (5 min)",
+        "  - Analytics collection: every 300s (5 min)",
+        banner
+    ]))
+    info("Initial collections complete (refresh_interval=%ds)", refresh_interval)
 
     # Wait brief period before starting scheduler to avoid race condition
     # This ensures initial collections complete and database locks release
@@ -1032,9 +1041,7 @@ def main():
     time.sleep(2)
     print("[CLOCK INIT] ✓ Safe to start scheduler")
 
-    print("=" * 60)
-    print("Press Ctrl+C or send SIGTERM to stop the clock process")
-    print("=" * 60)
+    print(f"{banner}\nPress Ctrl+C or send SIGTERM to stop the clock process\n{banner}")
     info("Clock process starting scheduler (blocking mode)")
 
     try:
@@ -2,7 +2,20 @@
 Configuration constants and settings for the Palo Alto Firewall Dashboard
 """
 import os
+import errno
 import json
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+# Optional fast JSON parser (3-5x faster than stdlib on the multi-MB vendor database)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # Note: Settings are stored as plain JSON (no encryption)
 # Only API keys in devices.json are encrypted
 
@@ -17,6 +30,11 @@ SETTINGS_FILE = os.path.join(os.path.dirname(__file__), 'settings.json')
 DEVICES_FILE = os.path.join(os.path.dirname(__file__), 'devices.json')
 VENDOR_DB_FILE = os.path.join(os.path.dirname(__file__), 'mac_vendor_db.json')
 SERVICE_PORT_DB_FILE = os.path.join(os.path.dirname(__file__), 'service_port_db.json')
+# Pickled sidecar caches of the parsed databases (skip JSON parse on cold start)
+VENDOR_DB_CACHE_FILE = VENDOR_DB_FILE + '.cache'
+# Indexed SQLite copy of the vendor database for point lookups without loading it
+VENDOR_DB_INDEX_FILE = os.path.join(os.path.dirname(__file__), 'mac_vendor_db.sqlite')
+SERVICE_PORT_DB_CACHE_FILE = SERVICE_PORT_DB_FILE + '.cache'
 AUTH_FILE = os.path.join(os.path.dirname(__file__), 'auth.json')
 METADATA_FILE = os.path.join(os.path.dirname(__file__), 'device_metadata.json')
 ALERTS_DB_FILE = os.path.join(os.path.dirname(__file__), 'alerts.db')  # Still uses SQLite
@@ -64,23 +82,37 @@ def detect_edition():
     return 'community'
 
 
+# Cached license info (resolved once, on first call)
+_license_info = None
+_license_info_loaded = False
+
+
 def get_license_info():
     """
-    Get Enterprise Edition license information if available
+    Get Enterprise Edition license information if available.
+    Result is cached after the first lookup (license file is read once per process).
 
     Returns:
         dict or None: License info if valid EE license, None otherwise
     """
+    global _license_info, _license_info_loaded
+
+    if _license_info_loaded:
+        return _license_info
+
     if EDITION != 'enterprise':
-        return None
+        _license_info = None
+    else:
+        try:
+            from license_validator import get_license_info as _get_license_info
+            _license_info = _get_license_info()
+        except ImportError:
+            _license_info = None
+        except Exception:
+            _license_info = None
 
-    try:
-        from license_validator import get_license_info as _get_license_info
-        return _get_license_info()
-    except ImportError:
-        return None
-    except Exception:
-        return None
+    _license_info_loaded = True
+    return _license_info
 
 
 # Detect edition on module load
@@ -176,6 +208,25 @@ _vendor_db_loaded = False
 _service_port_db_cache = None
 _service_port_db_loaded = False
 
+# Read-only connection to VENDOR_DB_INDEX_FILE, reopened when the index is rebuilt
+_vendor_index_conn = None
+_vendor_index_mtime = None
+_vendor_index_lock = threading.Lock()
+
+# Translation table for stripping ':' from MAC prefixes
+_COLON_STRIP = str.maketrans('', '', ':')
+# Translation table for stripping all MAC address separators
+_MAC_SEPARATOR_STRIP = str.maketrans('', '', ':-.')
+# IEEE assignment prefix lengths in hex digits, most specific first (MA-S, MA-M, MA-L)
+_VENDOR_PREFIX_LENGTHS = (9, 7, 6)
+
+# File stat cache for the database info endpoints (polled by the UI)
+# Format: {path: (st_mtime_ns, st_size, modified_date)}
+_db_file_stat_cache = {}
+# Entry counts for databases not loaded in memory
+# Format: {path: (st_mtime_ns, st_size, entry_count)}
+_db_entry_count_cache = {}
+
 # Default settings
 DEFAULT_SETTINGS = {
     'refresh_interval': 30,  # Dev testing: 30-second interval (Production: use 60)
@@ -207,12 +258,125 @@ DEFAULT_SETTINGS = {
     'reverse_dns_enabled': False  # Global toggle for reverse DNS lookups
 }
 
+def read_json_file(path):
+    """
+    Read and parse a JSON file, using orjson when it is installed.
+
+    Args:
+        path: JSON file path
+
+    Returns:
+        Parsed JSON data (raises on missing file or invalid JSON)
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Targets that turned out to be mount points (os.replace fails with EBUSY/EXDEV),
+# remembered so later saves write in place directly instead of via a throwaway temp file
+_inplace_write_paths = set()
+
+
+def atomic_write_bytes(path, payload, durable=False, mode=None):
+    """
+    Write bytes to a uniquely named sibling temp file and atomically rename it over
+    the target. A crash mid-write leaves the previous file intact instead of a
+    truncated one, and concurrent writers (threads or processes) never share a temp file.
+
+    Files that are bind-mounted individually into the container (see
+    docker-compose.yml) cannot be renamed over; the first failed rename is
+    remembered per path and those targets are written in place from then on.
+
+    Args:
+        path: Destination file path
+        payload: Bytes to write
+        durable: If True, fsync the data before it replaces the target
+        mode: Optional permission bits (default: keep the target's, else 0o644)
+    """
+    if path in _inplace_write_paths:
+        _write_in_place(path, payload, durable, mode)
+        return
+
+    if mode is None:
+        # mkstemp creates 0o600; keep the permissions the target already had
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except OSError:
+            mode = 0o644
+
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        _remove_quietly(tmp_path)
+        if e.errno not in (errno.EBUSY, errno.EXDEV):
+            raise
+        # Target is a mount point - rewrite it in place, now and on every later save
+        _inplace_write_paths.add(path)
+        _write_in_place(path, payload, durable, mode)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+
+def _write_in_place(path, payload, durable, mode):
+    """Overwrite path directly (for bind-mounted targets that can't be renamed over)"""
+    with open(path, 'wb') as f:
+        if mode is not None:
+            os.chmod(path, mode)
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _remove_quietly(path):
+    """Delete a file, ignoring errors (e.g. it was never created or already renamed)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def atomic_write_json(path, data, indent=None, durable=False, mode=None):
+    """
+    Serialize JSON and write it with atomic_write_bytes.
+
+    Args:
+        path: Destination file path
+        data: JSON-serializable data
+        indent: Optional JSON indentation (any value means 2 spaces with orjson)
+        durable: If True, fsync the data before it replaces the target
+        mode: Optional permission bits applied before any data is written
+    """
+    if orjson is not None:
+        # Serialized in a single C call; orjson only supports 2-space indentation
+        options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        payload = orjson.dumps(data, option=options)
+    else:
+        # Compact separators when not indenting, matching orjson's output
+        payload = json.dumps(data, indent=indent, separators=None if indent else (',', ':')).encode('utf-8')
+    atomic_write_bytes(path, payload, durable=durable, mode=mode)
+
 # Lazy import to avoid circular dependency
 def _get_logger():
     """Import logger functions lazily to avoid circular import"""
     from logger import debug, error, warning
     return debug, error, warning
 
+# Parsed settings keyed by settings.json (st_mtime_ns, st_size)
+_settings_cache = {'key': None, 'value': None}
+
 def ensure_settings_file_exists():
     """Create settings.json if it doesn't exist"""
     if not os.path.exists(SETTINGS_FILE):
@@ -230,25 +394,39 @@ def load_settings():
 
     v1.0.3: Merges missing keys from DEFAULT_SETTINGS to handle new settings
     added in later versions (e.g., chord_tag_filter, internal_traffic_filters).
+
+    The parsed file is cached and only re-read when its mtime/size changes.
+    Each call returns a new top-level dict; nested values are shared with the cache.
     """
-    # Ensure file exists before loading
-    ensure_settings_file_exists()
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except FileNotFoundError:
+        # Ensure file exists before loading
+        ensure_settings_file_exists()
+        st = None
 
     try:
-        if os.path.exists(SETTINGS_FILE):
-            with open(SETTINGS_FILE, 'r') as f:
-                settings = json.load(f)
-
-                # v1.0.3: Merge missing keys from DEFAULT_SETTINGS
-                # This ensures new settings added in later versions are available
-                # even if the settings file was created before those keys existed
-                merged = DEFAULT_SETTINGS.copy()
-                merged.update(settings)  # User settings override defaults
-                return merged
-
-        return DEFAULT_SETTINGS.copy()
+        if st is None:
+            st = os.stat(SETTINGS_FILE)
+
+        # Called on every debug() via logger.is_debug_enabled() - skip the
+        # read/parse while the file is unchanged
+        if _settings_cache['key'] == (st.st_mtime_ns, st.st_size):
+            return dict(_settings_cache['value'])
+
+        with open(SETTINGS_FILE, 'r') as f:
+            settings = json.load(f)
+
+        # v1.0.3: Merge missing keys from DEFAULT_SETTINGS
+        # This ensures new settings added in later versions are available
+        # even if the settings file was created before those keys existed.
+        # Always a fresh dict so callers can mutate without touching defaults.
+        merged = {**DEFAULT_SETTINGS, **settings}  # User settings override defaults
+        _settings_cache['key'] = (st.st_mtime_ns, st.st_size)
+        _settings_cache['value'] = merged
+        return dict(merged)
     except Exception:
-        return DEFAULT_SETTINGS.copy()
+        return dict(DEFAULT_SETTINGS)
 
 def save_settings(settings):
     """
@@ -257,19 +435,17 @@ def save_settings(settings):
     Only API keys in devices.json are encrypted.
     """
     debug, error, _ = _get_logger()
-    debug(f"Saving settings to file: {settings}")
+    debug("Saving settings to file: %s", settings)
     try:
         # Save settings as plain JSON (no encryption)
         # Only API keys need encryption, and those are in devices.json
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
+        atomic_write_json(SETTINGS_FILE, settings, indent=2, durable=True)
+        _settings_cache['key'] = None  # Next load_settings() re-reads the file
 
         debug("Settings saved successfully")
         return True
     except Exception as e:
-        error(f"Failed to save settings: {e}")
+        error("Failed to save settings: %s", e)
         return False
 
 
@@ -297,6 +473,10 @@ def load_notification_channels():
             debug("No notification channels found in settings, returning empty config")
             return get_default_notification_channels()
 
+        # Deep copy before decrypting in place - nested dicts are shared with the
+        # load_settings() cache
+        channels = json.loads(json.dumps(channels))
+
         # Decrypt sensitive fields
         try:
             from encryption import decrypt_string, is_encrypted
@@ -325,7 +505,7 @@ def load_notification_channels():
         except Exception as e:
             error(f"Failed to decrypt notification channel secrets: {e}")
 
-        debug(f"Loaded notification channels: {list(channels.keys())}")
+        debug("Loaded notification channels: %s", list(channels))
         return channels
 
     except Exception as e:
@@ -435,6 +615,67 @@ def get_default_notification_channels():
     }
 
 
+def _read_db_cache(cache_file, source_stat):
+    """
+    Load a pickled database cache if it was built from the current source file.
+
+    Args:
+        cache_file: Sidecar cache path
+        source_stat: os.stat_result of the JSON source file
+
+    Returns:
+        Cached data, or None if the cache is missing or stale
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            header = pickle.load(f)
+            if tuple(header[:2]) != (source_stat.st_mtime_ns, source_stat.st_size):
+                return None
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _read_db_cache_count(cache_file, mtime_ns, size):
+    """
+    Read the entry count from a database cache header without loading the data.
+
+    Returns:
+        int or None if the cache is missing, stale, or has no count
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            header = pickle.load(f)
+        if len(header) >= 3 and tuple(header[:2]) == (mtime_ns, size):
+            return header[2]
+    except Exception:
+        pass
+    return None
+
+
+def _write_db_cache(cache_file, source_stat, data):
+    """
+    Write a pickled database cache keyed by the JSON source file's mtime and size.
+    The header also records the entry count so info queries can skip the data.
+    Failures are ignored - the cache is only an optimization.
+    """
+    try:
+        # Header and data are two consecutive pickles, read back with two pickle.load calls
+        payload = (pickle.dumps((source_stat.st_mtime_ns, source_stat.st_size, len(data)), protocol=5)
+                   + pickle.dumps(data, protocol=5))
+        atomic_write_bytes(cache_file, payload)
+    except Exception:
+        _remove_db_cache(cache_file)
+
+
+def _remove_db_cache(cache_file):
+    """Delete a database sidecar cache if present"""
+    try:
+        os.remove(cache_file)
+    except OSError:
+        pass
+
+
 def load_vendor_database(use_cache=True):
     """
     Load MAC vendor database from file.
@@ -456,25 +697,41 @@ def load_vendor_database(use_cache=True):
 
     debug("Loading MAC vendor database from file")
 
-    if not os.path.exists(VENDOR_DB_FILE):
+    try:
+        source_stat = os.stat(VENDOR_DB_FILE)
+    except FileNotFoundError:
         debug("Vendor database file does not exist")
         _vendor_db_cache = {}
         _vendor_db_loaded = True
         return {}
 
     try:
-        with open(VENDOR_DB_FILE, 'r', encoding='utf-8') as f:
-            vendor_list = json.load(f)
+        # Use the pickled sidecar if it matches the current JSON file
+        vendor_dict = _read_db_cache(VENDOR_DB_CACHE_FILE, source_stat)
+        if vendor_dict is not None:
+            debug("Loaded %d MAC vendor entries from cache file", len(vendor_dict))
+            _ensure_vendor_index(source_stat, vendor_dict)
+            _vendor_db_cache = vendor_dict
+            _vendor_db_loaded = True
+            return vendor_dict
+
+        vendor_list = read_json_file(VENDOR_DB_FILE)
 
         # Convert list to dictionary for faster lookups
-        vendor_dict = {}
-        for entry in vendor_list:
-            mac_prefix = entry.get('macPrefix', '').upper().replace(':', '')
-            vendor_name = entry.get('vendorName', '')
-            if mac_prefix and vendor_name:
-                vendor_dict[mac_prefix] = vendor_name
+        # (single comprehension keeps the ~30k-entry loop in C). Vendor names are
+        # interned - large vendors own hundreds of prefixes and share one string.
+        intern = sys.intern
+        vendor_dict = {
+            prefix.upper().translate(_COLON_STRIP): intern(vendor_name)
+            for entry in vendor_list
+            if (prefix := entry.get('macPrefix')) and (vendor_name := entry.get('vendorName'))
+        }
+        # Release the parsed list (unused fields like blockType) before caching
+        del vendor_list
 
-        debug(f"Loaded {len(vendor_dict)} MAC vendor entries")
+        debug("Loaded %d MAC vendor entries", len(vendor_dict))
+        _write_db_cache(VENDOR_DB_CACHE_FILE, source_stat, vendor_dict)
+        _ensure_vendor_index(source_stat, vendor_dict)
 
         # Cache the loaded database
         _vendor_db_cache = vendor_dict
@@ -483,12 +740,144 @@ def load_vendor_database(use_cache=True):
         return vendor_dict
 
     except Exception as e:
-        error(f"Failed to load vendor database: {e}")
+        error("Failed to load vendor database: %s", e)
         _vendor_db_cache = {}
         _vendor_db_loaded = True
         return {}
 
 
+def _ensure_vendor_index(source_stat, vendor_dict):
+    """
+    Rebuild the SQLite vendor index if it is missing or older than the JSON file.
+    Failures are logged and ignored - lookups fall back to the in-memory dict.
+
+    Args:
+        source_stat: os.stat_result of VENDOR_DB_FILE
+        vendor_dict: Normalized {prefix: vendor_name} mapping
+    """
+    try:
+        if os.stat(VENDOR_DB_INDEX_FILE).st_mtime_ns >= source_stat.st_mtime_ns:
+            return
+    except FileNotFoundError:
+        pass
+
+    debug, error, _ = _get_logger()
+    tmp_path = None
+    try:
+        # Unique temp file per builder, so concurrent rebuilds can't clobber each other
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(VENDOR_DB_INDEX_FILE) or '.',
+                                        prefix=os.path.basename(VENDOR_DB_INDEX_FILE) + '.', suffix='.tmp')
+        # mkstemp creates 0o600; the index is a plain readable cache like the JSON
+        os.fchmod(fd, 0o644)
+        os.close(fd)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute('CREATE TABLE oui (prefix TEXT PRIMARY KEY, vendor TEXT NOT NULL) WITHOUT ROWID')
+            # Single transaction for all rows
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO oui (prefix, vendor) VALUES (?, ?)', vendor_dict.items())
+        finally:
+            conn.close()
+        os.replace(tmp_path, VENDOR_DB_INDEX_FILE)
+        debug("Built vendor index with %d entries", len(vendor_dict))
+    except Exception as e:
+        error("Failed to build vendor index: %s", e)
+        if tmp_path is not None:
+            _remove_quietly(tmp_path)
+
+
+def _get_vendor_index():
+    """
+    Get the read-only connection to the vendor index, (re)opening it if the
+    index file changed. Caller must hold _vendor_index_lock.
+
+    The index is not shared between containers, only the JSON file is, so an
+    index older than VENDOR_DB_FILE (e.g. after an upload elsewhere) is ignored.
+
+    Returns:
+        sqlite3.Connection or None if the index does not exist or is stale
+    """
+    global _vendor_index_conn, _vendor_index_mtime
+
+    try:
+        mtime = os.stat(VENDOR_DB_INDEX_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    if mtime is not None:
+        try:
+            if mtime < os.stat(VENDOR_DB_FILE).st_mtime_ns:
+                mtime = None
+        except FileNotFoundError:
+            pass  # No JSON to compare with - keep using the index
+
+    if mtime != _vendor_index_mtime or _vendor_index_conn is None:
+        if _vendor_index_conn is not None:
+            _vendor_index_conn.close()
+            _vendor_index_conn = None
+        _vendor_index_mtime = mtime
+        if mtime is not None:
+            _vendor_index_conn = sqlite3.connect(
+                f'file:{VENDOR_DB_INDEX_FILE}?mode=ro', uri=True, check_same_thread=False
+            )
+
+    return _vendor_index_conn
+
+
+def lookup_vendor(mac_prefix):
+    """
+    Look up the vendor for a normalized MAC prefix (uppercase hex, no separators).
+
+    Uses the in-memory database when it is already loaded; otherwise queries the
+    SQLite index so processes that only need a few lookups (e.g. the clock
+    process) never parse the full JSON file.
+
+    Args:
+        mac_prefix: Normalized prefix, e.g. '00000C'
+
+    Returns:
+        str: Vendor name, or None if not found
+    """
+    if _vendor_db_loaded:
+        return _vendor_db_cache.get(mac_prefix) if _vendor_db_cache else None
+
+    try:
+        with _vendor_index_lock:
+            conn = _get_vendor_index()
+            if conn is not None:
+                row = conn.execute('SELECT vendor FROM oui WHERE prefix = ?', (mac_prefix,)).fetchone()
+                return row[0] if row else None
+    except sqlite3.Error as e:
+        _, error, _ = _get_logger()
+        error("Vendor index lookup failed, loading full database: %s", e)
+
+    # No index yet, or it is stale - load the database (which also rebuilds the index)
+    return load_vendor_database().get(mac_prefix)
+
+
+def lookup_vendor_longest(mac_address):
+    """
+    Look up the vendor for a full or partial MAC address using longest-prefix match.
+
+    Tries the MA-S (9 hex digits), MA-M (7) and MA-L (6) prefixes in that order,
+    so a small block assigned inside a registration authority's OUI resolves to
+    the actual owner rather than the authority.
+
+    Args:
+        mac_address: MAC address in any common format ('00:00:0c:..', '00-00-0C-..', '0000.0c..')
+
+    Returns:
+        str: Vendor name, or None if not found
+    """
+    mac_hex = mac_address.upper().translate(_MAC_SEPARATOR_STRIP)
+    for prefix_len in _VENDOR_PREFIX_LENGTHS:
+        if len(mac_hex) >= prefix_len:
+            vendor_name = lookup_vendor(mac_hex[:prefix_len])
+            if vendor_name:
+                return vendor_name
+    return None
+
+
 def save_vendor_database(vendor_data):
     """
     Save MAC vendor database to file.
@@ -500,12 +889,11 @@ def save_vendor_database(vendor_data):
     debug("Saving MAC vendor database")
 
     try:
-        with open(VENDOR_DB_FILE, 'w') as f:
-            json.dump(vendor_data, f)
-            f.flush()
-            os.fsync(f.fileno())
+        _remove_db_cache(VENDOR_DB_CACHE_FILE)
+        # No fsync: the database is rebuilt from its upstream source if lost
+        atomic_write_json(VENDOR_DB_FILE, vendor_data)
 
-        debug(f"Vendor database saved successfully ({len(vendor_data)} entries)")
+        debug("Vendor database saved successfully (%d entries)", len(vendor_data))
 
         # Reload cache to reflect new data
         load_vendor_database(use_cache=False)
@@ -514,41 +902,104 @@ def save_vendor_database(vendor_data):
         return True
 
     except Exception as e:
-        error(f"Failed to save vendor database: {e}")
+        error("Failed to save vendor database: %s", e)
         return False
 
 
-def get_vendor_db_info():
+def _get_db_file_stat(path):
     """
-    Get information about the vendor database file.
+    Get size and formatted modification date for a database file.
+    Uses a single os.stat() call and only re-formats the date when mtime changes.
+
+    Args:
+        path: Database file path
+
+    Returns:
+        tuple: (file_size, modified_date) or None if the file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _db_file_stat_cache.pop(path, None)
+        return None
+
+    cached = _db_file_stat_cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[1], cached[2]
+
+    modified_date = datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+    _db_file_stat_cache[path] = (st.st_mtime_ns, st.st_size, modified_date)
+    return st.st_size, modified_date
+
+
+def _get_db_entry_count(path):
+    """
+    Count entries in a database file that is not loaded in memory.
+    The count is memoized on the mtime/size recorded by the preceding
+    _get_db_file_stat() call. On a miss it is read from the sidecar cache
+    header; the JSON is only parsed when no current sidecar exists.
+
+    Args:
+        path: Database file path
+
+    Returns:
+        int: Number of top-level entries (0 if unreadable)
     """
-    global _vendor_db_loaded, _vendor_db_cache
+    stat_entry = _db_file_stat_cache.get(path)
+    if not stat_entry:
+        return 0
+
+    cached = _db_entry_count_cache.get(path)
+    if cached and cached[:2] == stat_entry[:2]:
+        return cached[2]
 
+    entry_count = _read_db_cache_count(path + '.cache', stat_entry[0], stat_entry[1])
+    if entry_count is None:
+        try:
+            entry_count = len(read_json_file(path))
+        except Exception:
+            entry_count = 0
+
+    _db_entry_count_cache[path] = (stat_entry[0], stat_entry[1], entry_count)
+    return entry_count
+
+
+def _get_db_info(path, loaded, cached_db, label):
+    """
+    Build the info dict for a database file using a single os.stat() call.
+
+    Args:
+        path: Database file path
+        loaded: Whether the database is loaded in memory
+        cached_db: In-memory database (used for the entry count when loaded)
+        label: Database name for debug logging
+
+    Returns:
+        dict: exists, size, size_mb, modified, entries
+    """
     debug, _, _ = _get_logger()
-    debug("get_vendor_db_info called")
+    not_loaded = {
+        'exists': False,
+        'size': 0,
+        'size_mb': 0,
+        'modified': 'N/A',
+        'entries': 0
+    }
+
+    file_stat = _get_db_file_stat(path)
 
     # Check if database is loaded in memory first
-    if _vendor_db_loaded:
-        debug("Vendor database loaded in memory, returning cached info")
-        entry_count = len(_vendor_db_cache) if _vendor_db_cache else 0
+    if loaded:
+        debug("%s database loaded in memory, returning cached info", label)
+        entry_count = len(cached_db) if cached_db else 0
 
         # Database only "exists" if it has entries (not just an empty file)
         if entry_count == 0:
-            debug("Vendor database has zero entries, reporting as not loaded")
-            return {
-                'exists': False,
-                'size': 0,
-                'size_mb': 0,
-                'modified': 'N/A',
-                'entries': 0
-            }
-
-        # Get file stats if file exists
-        if os.path.exists(VENDOR_DB_FILE):
-            file_size = os.path.getsize(VENDOR_DB_FILE)
-            file_mtime = os.path.getmtime(VENDOR_DB_FILE)
-            from datetime import datetime
-            modified_date = datetime.fromtimestamp(file_mtime).strftime('%Y-%m-%d %H:%M:%S')
+            debug("%s database has zero entries, reporting as not loaded", label)
+            return not_loaded
+
+        if file_stat:
+            file_size, modified_date = file_stat
         else:
             # In memory but file deleted (unusual case)
             file_size = 0
@@ -562,46 +1013,35 @@ def get_vendor_db_info():
             'entries': entry_count
         }
 
-    # Fall back to checking file existence
-    if os.path.exists(VENDOR_DB_FILE):
-        file_size = os.path.getsize(VENDOR_DB_FILE)
-        file_mtime = os.path.getmtime(VENDOR_DB_FILE)
-        from datetime import datetime
-        modified_date = datetime.fromtimestamp(file_mtime).strftime('%Y-%m-%d %H:%M:%S')
+    # Fall back to the file itself
+    if not file_stat:
+        return not_loaded
 
-        # Count entries
-        try:
-            with open(VENDOR_DB_FILE, 'r', encoding='utf-8') as f:
-                vendor_list = json.load(f)
-                entry_count = len(vendor_list)
-        except:
-            entry_count = 0
+    file_size, modified_date = file_stat
 
-        # Database only "exists" if it has entries
-        if entry_count == 0:
-            return {
-                'exists': False,
-                'size': 0,
-                'size_mb': 0,
-                'modified': 'N/A',
-                'entries': 0
-            }
+    # Count entries (re-parsed only when the file changes)
+    entry_count = _get_db_entry_count(path)
 
-        return {
-            'exists': True,
-            'size': file_size,
-            'size_mb': round(file_size / (1024 * 1024), 2),
-            'modified': modified_date,
-            'entries': entry_count
-        }
-    else:
-        return {
-            'exists': False,
-            'size': 0,
-            'size_mb': 0,
-            'modified': 'N/A',
-            'entries': 0
-        }
+    # Database only "exists" if it has entries
+    if entry_count == 0:
+        return not_loaded
+
+    return {
+        'exists': True,
+        'size': file_size,
+        'size_mb': round(file_size / (1024 * 1024), 2),
+        'modified': modified_date,
+        'entries': entry_count
+    }
+
+
+def get_vendor_db_info():
+    """
+    Get information about the vendor database file.
+    """
+    debug, _, _ = _get_logger()
+    debug("get_vendor_db_info called")
+    return _get_db_info(VENDOR_DB_FILE, _vendor_db_loaded, _vendor_db_cache, "Vendor")
 
 
 def load_service_port_database(use_cache=True):
@@ -626,17 +1066,27 @@ def load_service_port_database(use_cache=True):
 
     debug("Loading service port database from file")
 
-    if not os.path.exists(SERVICE_PORT_DB_FILE):
+    try:
+        source_stat = os.stat(SERVICE_PORT_DB_FILE)
+    except FileNotFoundError:
         debug("Service port database file does not exist")
         _service_port_db_cache = {}
         _service_port_db_loaded = True
         return {}
 
     try:
-        with open(SERVICE_PORT_DB_FILE, 'r', encoding='utf-8') as f:
-            service_data = json.load(f)
+        # Use the pickled sidecar if it matches the current JSON file
+        service_data = _read_db_cache(SERVICE_PORT_DB_CACHE_FILE, source_stat)
+        if service_data is not None:
+            debug("Loaded %d service port entries from cache file", len(service_data))
+            _service_port_db_cache = service_data
+            _service_port_db_loaded = True
+            return service_data
+
+        service_data = read_json_file(SERVICE_PORT_DB_FILE)
 
-        debug(f"Loaded service port database with {len(service_data)} port entries")
+        debug("Loaded service port database with %d port entries", len(service_data))
+        _write_db_cache(SERVICE_PORT_DB_CACHE_FILE, source_stat, service_data)
 
         # Cache the loaded database
         _service_port_db_cache = service_data
@@ -645,7 +1095,7 @@ def load_service_port_database(use_cache=True):
         return service_data
 
     except Exception as e:
-        error(f"Failed to load service port database: {e}")
+        error("Failed to load service port database: %s", e)
         _service_port_db_cache = {}
         _service_port_db_loaded = True
         return {}
@@ -662,12 +1112,11 @@ def save_service_port_database(service_data):
     debug("Saving service port database")
 
     try:
-        with open(SERVICE_PORT_DB_FILE, 'w') as f:
-            json.dump(service_data, f)
-            f.flush()
-            os.fsync(f.fileno())
+        _remove_db_cache(SERVICE_PORT_DB_CACHE_FILE)
+        # No fsync: the database is rebuilt from its upstream source if lost
+        atomic_write_json(SERVICE_PORT_DB_FILE, service_data)
 
-        debug(f"Service port database saved successfully ({len(service_data)} port entries)")
+        debug("Service port database saved successfully (%d port entries)", len(service_data))
 
         # Reload cache to reflect new data
         load_service_port_database(use_cache=False)
@@ -676,7 +1125,7 @@ def save_service_port_database(service_data):
         return True
 
     except Exception as e:
-        error(f"Failed to save service port database: {e}")
+        error("Failed to save service port database: %s", e)
         return False
 
 
@@ -684,83 +1133,6 @@ def get_service_port_db_info():
     """
     Get information about the service port database file.
     """
-    global _service_port_db_loaded, _service_port_db_cache
-
     debug, _, _ = _get_logger()
     debug("get_service_port_db_info called")
-
-    # Check if database is loaded in memory first
-    if _service_port_db_loaded:
-        debug("Service port database loaded in memory, returning cached info")
-        entry_count = len(_service_port_db_cache) if _service_port_db_cache else 0
-
-        # Database only "exists" if it has entries (not just an empty file)
-        if entry_count == 0:
-            debug("Service port database has zero entries, reporting as not loaded")
-            return {
-                'exists': False,
-                'size': 0,
-                'size_mb': 0,
-                'modified': 'N/A',
-                'entries': 0
-            }
-
-        # Get file stats if file exists
-        if os.path.exists(SERVICE_PORT_DB_FILE):
-            file_size = os.path.getsize(SERVICE_PORT_DB_FILE)
-            file_mtime = os.path.getmtime(SERVICE_PORT_DB_FILE)
-            from datetime import datetime
-            modified_date = datetime.fromtimestamp(file_mtime).strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            # In memory but file deleted (unusual case)
-            file_size = 0
-            modified_date = 'Loaded in memory'
-
-        return {
-            'exists': True,
-            'size': file_size,
-            'size_mb': round(file_size / (1024 * 1024), 2) if file_size > 0 else 0,
-            'modified': modified_date,
-            'entries': entry_count
-        }
-
-    # Fall back to checking file existence
-    if os.path.exists(SERVICE_PORT_DB_FILE):
-        file_size = os.path.getsize(SERVICE_PORT_DB_FILE)
-        file_mtime = os.path.getmtime(SERVICE_PORT_DB_FILE)
-        from datetime import datetime
-        modified_date = datetime.fromtimestamp(file_mtime).strftime('%Y-%m-%d %H:%M:%S')
-
-        # Count entries
-        try:
-            with open(SERVICE_PORT_DB_FILE, 'r', encoding='utf-8') as f:
-                service_data = json.load(f)
-                entry_count = len(service_data)
-        except:
-            entry_count = 0
-
-        # Database only "exists" if it has entries
-        if entry_count == 0:
-            return {
-                'exists': False,
-                'size': 0,
-                'size_mb': 0,
-                'modified': 'N/A',
-                'entries': 0
-            }
-
-        return {
-            'exists': True,
-            'size': file_size,
-            'size_mb': round(file_size / (1024 * 1024), 2),
-            'modified': modified_date,
-            'entries': entry_count
-        }
-    else:
-        return {
-            'exists': False,
-            'size': 0,
-            'size_mb': 0,
-            'modified': 'N/A',
-            'entries': 0
-        }
+    return _get_db_info(SERVICE_PORT_DB_FILE, _service_port_db_loaded, _service_port_db_cache, "Service port")
@@ -5,13 +5,24 @@ import json
 import os
 import uuid
 from datetime import datetime
-import requests
-import xml.etree.ElementTree as ET
-from config import DEVICES_FILE
+from config import DEVICES_FILE, read_json_file, atomic_write_json
 from logger import debug, error, exception, warning
 # Only import what we need: encrypt_string and decrypt_string for API keys only
 from encryption import encrypt_string, decrypt_string
 
+# Optional C-accelerated XML parsing for firewall responses (stdlib ElementTree fallback)
+# Parser is hardened the same way as defusedxml: no entity expansion, no network access
+try:
+    from lxml import etree as lxml_etree
+    _LXML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+    _HOSTNAME_XPATH = lxml_etree.XPath('//hostname')
+except ImportError:
+    lxml_etree = None
+
+# Use UUID namespace for PANfm (custom namespace for this application)
+# This is a standard UUID v5 namespace UUID - parsed once at import
+PANFM_NAMESPACE = uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
+
 
 def generate_deterministic_device_id(ip, name=None):
     """
@@ -36,17 +47,13 @@ def generate_deterministic_device_id(ip, name=None):
         >>> generate_deterministic_device_id("192.168.1.1")
         '550e8400-e29b-41d4-a716-446655440000'  # Identical to above
     """
-    # Use UUID namespace for PANfm (custom namespace for this application)
-    # This is a standard UUID v5 namespace UUID
-    PANFM_NAMESPACE = uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
-
     # Generate deterministic UUID from IP address
     # We use ONLY the IP for now (name could be changed by user)
     unique_string = ip
 
     device_id = str(uuid.uuid5(PANFM_NAMESPACE, unique_string))
 
-    debug(f"Generated deterministic device_id for IP {ip}: {device_id}")
+    debug("Generated deterministic device_id for IP %s: %s", ip, device_id)
     return device_id
 
 class DeviceManager:
@@ -54,6 +61,11 @@ class DeviceManager:
 
     def __init__(self, devices_file=DEVICES_FILE):
         self.devices_file = devices_file
+        # Cached groups list, tagged with the devices.json mtime it was read at
+        self._groups_cache = None
+        self._groups_cache_mtime = None
+        # Decrypted devices list, as ((st_mtime_ns, st_size), devices)
+        self._decrypted_cache = None
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -73,35 +85,50 @@ class DeviceManager:
         Args:
             decrypt_api_keys: If True, decrypts api_key field. If False, returns encrypted api_keys.
                              Default True for internal use, False for API responses.
+
+        The decrypted view is cached until devices.json changes, so back-to-back
+        calls skip the per-device decryption. The returned list and device dicts
+        are never the cached objects, so callers may mutate them freely.
         """
         try:
-            with open(self.devices_file, 'r') as f:
-                data = json.load(f)
-                devices = data.get('devices', [])
-                debug("Loaded %d devices from %s", len(devices), self.devices_file)
-
-                if decrypt_api_keys:
-                    # Decrypt ONLY the api_key field for internal use
-                    decrypted_devices = []
-                    for device in devices:
-                        device_copy = device.copy()
-                        if 'api_key' in device_copy and device_copy['api_key']:
-                            try:
-                                decrypted_key = decrypt_string(device_copy['api_key'])
-                                device_copy['api_key'] = decrypted_key
-                                debug(f"Successfully decrypted API key for device {device_copy.get('name', 'unknown')}")
-                            except Exception as decrypt_err:
-                                # Decryption failed - log the error and set empty key
-                                error(f"Failed to decrypt API key for device {device_copy.get('name', 'unknown')}: {str(decrypt_err)}")
-                                device_copy['api_key'] = ""  # Set to empty to prevent using corrupted key
-                                warning(f"Device {device_copy.get('name', 'unknown')} API key could not be decrypted - authentication will fail")
-                        decrypted_devices.append(device_copy)
-                    debug("Decrypted api_key for %d device records", len(decrypted_devices))
-                    return decrypted_devices
-                else:
-                    # Return with encrypted api_keys for API responses
-                    debug("Returning %d devices with encrypted api_keys", len(devices))
-                    return devices
+            if decrypt_api_keys:
+                st = os.stat(self.devices_file)
+                cache_key = (st.st_mtime_ns, st.st_size)
+                cached = self._decrypted_cache
+                if cached is not None and cached[0] == cache_key:
+                    debug("Returning %d cached decrypted devices", len(cached[1]))
+                    return [device.copy() for device in cached[1]]
+
+            data = read_json_file(self.devices_file)
+            devices = data.get('devices', [])
+            debug("Loaded %d devices from %s", len(devices), self.devices_file)
+
+            if decrypt_api_keys:
+                # Decrypt ONLY the api_key field for internal use
+                # The parsed list is freshly built from the file, so decrypt in place
+                decrypt_failed = False
+                for device in devices:
+                    api_key = device.get('api_key')
+                    if api_key:
+                        try:
+                            device['api_key'] = decrypt_string(api_key)
+                            debug("Successfully decrypted API key for device %s", device.get('name', 'unknown'))
+                        except Exception as decrypt_err:
+                            # Decryption failed - log the error and set empty key
+                            error("Failed to decrypt API key for device %s: %s", device.get('name', 'unknown'), decrypt_err)
+                            device['api_key'] = ""  # Set to empty to prevent using corrupted key
+                            decrypt_failed = True
+                            warning("Device %s API key could not be decrypted - authentication will fail", device.get('name', 'unknown'))
+                debug("Decrypted api_key for %d device records", len(devices))
+                # Don't cache failures - they may clear up once the encryption key is fixed
+                if not decrypt_failed:
+                    self._decrypted_cache = (cache_key, devices)
+                    return [device.copy() for device in devices]
+                return devices
+            else:
+                # Return with encrypted api_keys for API responses
+                debug("Returning %d devices with encrypted api_keys", len(devices))
+                return devices
         except Exception as e:
             exception("Error loading devices: %s", str(e))
             return []
@@ -111,9 +138,10 @@ class DeviceManager:
         Save devices to file with encryption.
         Only the api_key field is encrypted, other fields remain plain text.
         """
+        self._decrypted_cache = None
         try:
-            with open(self.devices_file, 'r') as f:
-                data = json.load(f)
+            # Groups come from the in-memory cache, so only one file write is needed
+            groups = self._load_groups()
 
             # Encrypt ONLY the api_key field for each device
             # IMPORTANT: Check if already encrypted to prevent double encryption
@@ -126,19 +154,18 @@ class DeviceManager:
                         # Only encrypt if not already encrypted (prevent double encryption)
                         if not is_encrypted(device_copy['api_key']):
                             device_copy['api_key'] = encrypt_string(device_copy['api_key'])
-                            debug(f"Encrypted API key for device {device_copy.get('name', 'unknown')}")
+                            debug("Encrypted API key for device %s", device_copy.get('name', 'unknown'))
                         else:
                             # Already encrypted, leave as-is
-                            debug(f"API key already encrypted for device {device_copy.get('name', 'unknown')}, skipping encryption")
+                            debug("API key already encrypted for device %s, skipping encryption", device_copy.get('name', 'unknown'))
                     except Exception as encrypt_err:
                         # Encryption failed - log the error
-                        error(f"Failed to encrypt API key for device {device_copy.get('name', 'unknown')}: {str(encrypt_err)}")
+                        error("Failed to encrypt API key for device %s: %s", device_copy.get('name', 'unknown'), encrypt_err)
                         raise Exception(f"Cannot save device {device_copy.get('name', 'unknown')}: encryption failed")
                 encrypted_devices.append(device_copy)
 
-            data['devices'] = encrypted_devices
-            with open(self.devices_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            data = {'devices': encrypted_devices, 'groups': groups}
+            self._write_file(data)
 
             debug("Saved %d devices with encrypted api_keys to %s", len(devices), self.devices_file)
             return True
@@ -166,16 +193,17 @@ class DeviceManager:
         - Historical data correlation preserved
         - Duplicate detection possible (same IP = duplicate device)
         """
-        # Load devices WITH decryption so save_devices can re-encrypt all consistently
-        devices = self.load_devices(decrypt_api_keys=True)
+        # Load devices WITHOUT decryption - untouched devices keep their ciphertext and
+        # save_devices only encrypts the new device's api_key
+        devices = self.load_devices(decrypt_api_keys=False)
 
         # Generate deterministic device_id from IP address
         deterministic_id = generate_deterministic_device_id(ip, name)
 
         # Check for duplicate IP (same device_id = same IP)
-        existing_device = self.get_device(deterministic_id)
+        existing_device = next((d for d in devices if d.get('id') == deterministic_id), None)
         if existing_device:
-            warning(f"Device with IP {ip} already exists (id: {deterministic_id}). Updating instead of creating.")
+            warning("Device with IP %s already exists (id: %s). Updating instead of creating.", ip, deterministic_id)
             # Update existing device instead of creating duplicate
             return self.update_device(deterministic_id, {
                 'name': name,
@@ -202,45 +230,105 @@ class DeviceManager:
 
         devices.append(new_device)
         self.save_devices(devices)
-        debug(f"Added new device '{name}' with deterministic ID: {deterministic_id}")
+        debug("Added new device '%s' with deterministic ID: %s", name, deterministic_id)
         return new_device
 
     def update_device(self, device_id, updates):
-        """Update an existing device"""
-        # Load devices WITH decryption so save_devices can re-encrypt all consistently
-        devices = self.load_devices(decrypt_api_keys=True)
-        for i, device in enumerate(devices):
-            if device.get('id') == device_id:
-                devices[i].update(updates)
-                self.save_devices(devices)
-                return devices[i]
-        return None
+        """Update an existing device (returned without api_key; raises if the save fails)"""
+        return self.bulk_update({device_id: updates}).get(device_id)
+
+    def bulk_update(self, updates):
+        """
+        Apply updates to several devices with a single load and save.
+
+        Devices are loaded with encrypted api_keys, so only api_keys supplied in
+        the updates are (re-)encrypted; untouched devices keep their ciphertext.
+
+        Args:
+            updates: Dict mapping device_id to a dict of fields to update
+
+        Returns:
+            dict: device_id -> updated device for each device that was found.
+                  The api_key field is left out, so the result is the same
+                  whether or not the key was part of the update.
+
+        Raises:
+            Exception: If the updated devices could not be saved
+        """
+        debug("bulk_update called for %d devices", len(updates))
+        devices = self.load_devices(decrypt_api_keys=False)
+        updated = {}
+        for device in devices:
+            device_id = device.get('id')
+            if device_id in updates:
+                device.update(updates[device_id])
+                updated[device_id] = device
+        if updated and not self.save_devices(devices):
+            raise Exception(f"Failed to save {len(updated)} updated device(s)")
+        return {
+            device_id: {key: value for key, value in device.items() if key != 'api_key'}
+            for device_id, device in updated.items()
+        }
 
     def delete_device(self, device_id):
         """Delete a device"""
         debug("delete_device called for device_id: %s", device_id)
-        # Load devices WITH decryption so save_devices can re-encrypt all consistently
-        devices = self.load_devices(decrypt_api_keys=True)
+        # Load devices WITHOUT decryption - remaining devices are written back with their ciphertext
+        devices = self.load_devices(decrypt_api_keys=False)
         initial_count = len(devices)
         devices = [d for d in devices if d.get('id') != device_id]
         debug("Deleted device. Device count: %d -> %d", initial_count, len(devices))
         return self.save_devices(devices)
 
+    def _write_file(self, data):
+        """Write the full devices.json structure and refresh the groups cache"""
+        atomic_write_json(self.devices_file, data, indent=2, durable=True)
+        self._groups_cache = list(data.get('groups', []))
+        self._groups_cache_mtime = os.stat(self.devices_file).st_mtime_ns
+
+    def _load_groups(self):
+        """
+        Load device groups, using the cached copy while devices.json is unchanged.
+        Raises if the file cannot be read.
+        """
+        mtime = os.stat(self.devices_file).st_mtime_ns
+        if self._groups_cache is None or self._groups_cache_mtime != mtime:
+            data = read_json_file(self.devices_file)
+            self._groups_cache = data.get('groups', [])
+            self._groups_cache_mtime = mtime
+        return self._groups_cache
+
     def get_groups(self):
         """Get list of device groups"""
         debug("get_groups called")
         try:
-            with open(self.devices_file, 'r') as f:
-                data = json.load(f)
-                groups = data.get('groups', [])
-                debug("Found %d device groups", len(groups))
-                return groups
+            groups = list(self._load_groups())
+            debug("Found %d device groups", len(groups))
+            return groups
         except Exception as e:
             debug("Error loading groups, returning default: %s", str(e))
             return ["Default"]
 
+    def set_groups(self, groups):
+        """
+        Replace the list of device groups.
+        Updates devices.json and the in-memory groups cache together.
+        """
+        debug("set_groups called with %d groups", len(groups))
+        try:
+            data = read_json_file(self.devices_file)
+            data['groups'] = list(groups)
+            self._write_file(data)
+            return True
+        except Exception as e:
+            exception("Error saving device groups: %s", str(e))
+            return False
+
     def test_connection(self, ip, api_key):
         """Test connection to a device"""
+        # Imported here - only needed for connection tests, keeps module import light
+        import requests
+        import xml.etree.ElementTree as ET
         try:
             base_url = f"https://{ip}/api/"
             params = {
@@ -251,9 +339,15 @@ class DeviceManager:
             from utils import api_request_get
             response = api_request_get(base_url, params=params, verify=False, timeout=5)
             if response.status_code == 200:
-                root = ET.fromstring(response.text)
+                # Parse raw bytes - avoids decoding the body to text first
+                if lxml_etree is not None:
+                    root = lxml_etree.fromstring(response.content, parser=_LXML_PARSER)
+                    has_hostname = bool(_HOSTNAME_XPATH(root))
+                else:
+                    root = ET.fromstring(response.content)
+                    has_hostname = root.find('.//hostname') is not None
                 # Check if we got a valid response
-                if root.find('.//hostname') is not None:
+                if has_hostname:
                     return {"success": True, "message": "Connection successful"}
             return {"success": False, "message": "Invalid response from firewall"}
         except requests.exceptions.Timeout:
@@ -264,5 +358,25 @@ class DeviceManager:
     # Note: Device migration is handled by the standalone migrate_api_keys.py script
     # Only API keys need encryption, all other device fields remain in plain text
 
-# Initialize device manager
-device_manager = DeviceManager()
+# Shared device manager instance (created on first use, not at import time)
+_device_manager = None
+
+
+def get_device_manager():
+    """
+    Get the shared DeviceManager instance, creating it on first call.
+
+    Returns:
+        DeviceManager: Shared device manager
+    """
+    global _device_manager
+    if _device_manager is None:
+        _device_manager = DeviceManager()
+    return _device_manager
+
+
+def __getattr__(name):
+    """Backward compatibility for 'from device_manager import device_manager'"""
+    if name == 'device_manager':
+        return get_device_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,9 @@ Device Metadata Manager for PANfm
 
 Manages custom names, comments, and tags for connected devices keyed by MAC address.
 Uses per-device format with device_id as top-level key: {device_id: {mac: metadata}}
-Metadata is stored encrypted at rest in device_metadata.json.
+Metadata is stored encrypted at rest in device_metadata.json as a single Fernet
+token (encrypt_blob); files in the older per-value encrypted JSON format are
+migrated on first load.
 
 This file is kept for backward compatibility with:
   - backup_restore.py (backup/restore)
@@ -11,16 +13,89 @@ This file is kept for backward compatibility with:
   - throughput_collector.py (metadata enrichment)
 """
 import os
+import sys
 import json
-import re
-from config import METADATA_FILE, load_settings
-from encryption import encrypt_dict, decrypt_dict
-from logger import debug, info, warning, error, exception
+import threading
+from copy import deepcopy
+from uuid import UUID
+from config import METADATA_FILE, load_settings, atomic_write_bytes
+from encryption import decrypt_dict, encrypt_blob, decrypt_blob, is_encrypted_blob
+from logger import debug, info, warning, error, exception, is_debug_enabled
 
 # Global cache for metadata (loaded at startup, updated on changes)
 _metadata_cache = None
 _cache_loaded = False
 
+# Serializes cache read-modify-write cycles and saves (edits are written synchronously)
+_write_lock = threading.RLock()
+
+# Written by save_metadata: MAC keys in the file are already lowercase
+_NORMALIZED_MARKER = '__normalized__'
+
+# Tag/location sets per device_id (None for legacy format), stored with the device
+# dict they were built from. Edits replace that dict (copy-on-write), so a stale
+# entry is detected by identity and only that device is rescanned.
+_value_index = {}
+
+# Sorted tag/location lists keyed by (device_id, position), stored with the cache
+# dict they were computed from. Every write replaces _metadata_cache, so an
+# unchanged cache means the list is still current.
+_sorted_values_cache = {}
+
+
+def _is_uuid(value):
+    """
+    Check whether a top-level key is a device ID (UUID).
+    Used to tell per-device format from legacy MAC-keyed format.
+
+    Args:
+        value: Key to check
+
+    Returns:
+        bool: True if value parses as a UUID
+    """
+    try:
+        UUID(value)
+        return True
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+def _canon_device_id(device_id):
+    """
+    Normalize a device ID to canonical lowercase-hyphenated UUID form, so IDs that
+    differ only in case or hyphenation hit the same metadata key.
+
+    Args:
+        device_id: Device ID (may be None)
+
+    Returns:
+        str: Canonical device ID, or the input unchanged if it is empty or not a UUID
+    """
+    if not device_id:
+        return device_id
+    try:
+        return str(UUID(device_id))
+    except (ValueError, TypeError, AttributeError):
+        return device_id
+
+
+def _normalize_macs(entries):
+    """
+    Lowercase (and intern) the MAC keys of a {mac: metadata} dict.
+    Returns the dict itself when every key is already lowercase, the usual
+    case after the first save.
+
+    Args:
+        entries (dict): {mac: metadata}
+
+    Returns:
+        dict: {lowercase mac: metadata}
+    """
+    if all(mac.islower() for mac in entries):
+        return entries
+    return {sys.intern(mac.lower()): metadata for mac, metadata in entries.items()}
+
 
 def init_metadata_file():
     """
@@ -37,12 +112,8 @@ def init_metadata_file():
         
         try:
             # Encrypt empty structure (following encryption pattern)
-            encrypted_data = encrypt_dict(empty_data)
-            with open(METADATA_FILE, 'w') as f:
-                json.dump(encrypted_data, f, indent=2)
-            
-            # Set file permissions to 600
-            os.chmod(METADATA_FILE, 0o600)
+            # Written with file permissions 600
+            atomic_write_bytes(METADATA_FILE, encrypt_blob(empty_data), mode=0o600)
             
             info("Created empty device metadata file")
             return True
@@ -58,6 +129,8 @@ def load_metadata(device_id=None, use_cache=True):
     """
     Load and decrypt device metadata from JSON file.
     Supports both per-device format (v1.6.0+) and global format (legacy).
+    The returned dict is the cached one and must be treated as read-only;
+    use load_metadata_mutable() to get a copy to edit.
 
     Args:
         device_id: Specific device ID to load metadata for. If None and per-device format, returns all.
@@ -67,6 +140,7 @@ def load_metadata(device_id=None, use_cache=True):
         dict: If device_id provided: {mac: metadata}
               If device_id None: {device_id: {mac: metadata}} (per-device) or {mac: metadata} (legacy)
     """
+    device_id = _canon_device_id(device_id)
     global _metadata_cache, _cache_loaded
 
     # Return cached data if available and cache is enabled
@@ -74,58 +148,65 @@ def load_metadata(device_id=None, use_cache=True):
         debug("Returning cached device metadata")
         if device_id:
             # Return specific device's metadata
-            return _metadata_cache.get(device_id, {}).copy()
-        else:
-            return _metadata_cache.copy()
+            return _metadata_cache.get(device_id, {})
+        return _metadata_cache
 
     debug(f"Loading device metadata from disk (device_id={device_id})")
     try:
-        # Check if file exists
-        if not os.path.exists(METADATA_FILE):
+        # Check if file exists and is non-empty with a single stat
+        try:
+            file_size = os.stat(METADATA_FILE).st_size
+        except FileNotFoundError:
             debug("Metadata file does not exist, initializing")
             init_metadata_file()
             return {}
 
-        # Check if file is empty
-        if os.path.getsize(METADATA_FILE) == 0:
+        if file_size == 0:
             debug("Metadata file is empty, initializing")
             init_metadata_file()
             return {}
 
-        # Load data
-        with open(METADATA_FILE, 'r') as f:
-            data = json.load(f)
+        # Load data: a single encrypted blob, or older JSON with per-value encryption
+        with open(METADATA_FILE, 'rb') as f:
+            raw = f.read()
+        is_blob = is_encrypted_blob(raw)
+        data = None if is_blob else json.loads(raw)
 
         # Try to decrypt
         try:
-            decrypted_data = decrypt_dict(data)
+            decrypted_data = decrypt_blob(raw) if is_blob else decrypt_dict(data)
             debug("Successfully loaded and decrypted metadata")
+            already_normalized = decrypted_data.pop(_NORMALIZED_MARKER, False) is True
 
             if not decrypted_data:
                 debug("Decrypted metadata is empty")
                 return {}
 
             # Detect format: Check if first key is UUID (per-device) or MAC (global)
-            first_key = list(decrypted_data.keys())[0]
-            uuid_pattern = r'^[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}$'
+            first_key = next(iter(decrypted_data))
 
-            if re.match(uuid_pattern, first_key, re.IGNORECASE):
+            if _is_uuid(first_key):
                 # New per-device format: {device_id: {mac: metadata}}
                 debug("Detected per-device format")
 
-                # Normalize MAC addresses within each device
-                normalized_data = {}
-                for dev_id, device_metadata in decrypted_data.items():
-                    normalized_device = {}
-                    for mac, metadata in device_metadata.items():
-                        normalized_mac = mac.lower()
-                        normalized_device[normalized_mac] = metadata
-                    normalized_data[dev_id] = normalized_device
+                # Normalize MAC addresses within each device (files written by
+                # save_metadata are already normalized and adopted as-is)
+                if already_normalized:
+                    normalized_data = decrypted_data
+                else:
+                    normalized_data = {
+                        _canon_device_id(dev_id): _normalize_macs(device_metadata)
+                        for dev_id, device_metadata in decrypted_data.items()
+                    }
 
                 # Update global cache
                 _metadata_cache = normalized_data.copy()
                 _cache_loaded = True
 
+                if not is_blob:
+                    debug("Migrating metadata file to single-blob encryption")
+                    save_metadata(normalized_data)
+
                 # Return specific device or all
                 if device_id:
                     result = normalized_data.get(device_id, {})
@@ -140,15 +221,19 @@ def load_metadata(device_id=None, use_cache=True):
                 debug("Detected global (legacy) format")
 
                 # Normalize MAC addresses
-                normalized_data = {}
-                for mac, metadata in decrypted_data.items():
-                    normalized_mac = mac.lower()
-                    normalized_data[normalized_mac] = metadata
+                if already_normalized:
+                    normalized_data = decrypted_data
+                else:
+                    normalized_data = _normalize_macs(decrypted_data)
 
                 # Update global cache (store in old format)
                 _metadata_cache = normalized_data.copy()
                 _cache_loaded = True
 
+                if not is_blob:
+                    debug("Migrating metadata file to single-blob encryption")
+                    save_metadata(normalized_data)
+
                 debug(f"Loaded {len(normalized_data)} entries in legacy format")
                 return normalized_data
 
@@ -157,10 +242,7 @@ def load_metadata(device_id=None, use_cache=True):
             debug(f"Decryption failed: {decrypt_error}")
             if isinstance(data, dict):
                 debug("Metadata file appears unencrypted, encrypting...")
-                encrypted_data = encrypt_dict(data)
-                with open(METADATA_FILE, 'w') as f:
-                    json.dump(encrypted_data, f, indent=2)
-                os.chmod(METADATA_FILE, 0o600)
+                atomic_write_bytes(METADATA_FILE, encrypt_blob(data), mode=0o600)
                 return load_metadata(device_id=device_id, use_cache=False)
             else:
                 raise decrypt_error
@@ -174,62 +256,98 @@ def load_metadata(device_id=None, use_cache=True):
         return {}
 
 
-def save_metadata(metadata_dict):
+def load_metadata_mutable(device_id=None):
+    """
+    Load metadata as a deep copy the caller may freely mutate and pass to save_metadata.
+    load_metadata itself returns the shared cache, which must be treated as read-only.
+
+    Args:
+        device_id: Specific device ID to load metadata for. If None, returns all.
+
+    Returns:
+        dict: Independent copy of the metadata (same shapes as load_metadata)
+    """
+    return deepcopy(load_metadata(device_id=device_id))
+
+
+def save_metadata(metadata_dict, durable=True, already_normalized=False):
     """
     Encrypt and save device metadata to JSON file.
     Supports both per-device format {device_id: {mac: metadata}} and global format {mac: metadata}.
 
     Args:
         metadata_dict: Metadata dictionary (per-device or global format)
+        durable: If True (default), fsync before the atomic rename. Single-entry UI
+                 edits pass False; the rename alone keeps the file consistent, only
+                 the most recent edit is at risk on power loss.
+        already_normalized: If True, metadata_dict is trusted to have canonical device IDs
+                            and lowercase MACs (e.g. the cache itself) and is adopted as the
+                            cache without re-normalizing or copying. Callers passing
+                            untrusted keys must leave this False.
 
     Returns:
         bool: True on success, False on error
     """
     global _metadata_cache, _cache_loaded
 
-    debug("Saving device metadata")
-    try:
-        # Detect format and normalize
-        if metadata_dict:
-            first_key = list(metadata_dict.keys())[0]
-            uuid_pattern = r'^[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}$'
-
-            if re.match(uuid_pattern, first_key, re.IGNORECASE):
-                # Per-device format
-                normalized_dict = {}
-                for dev_id, device_metadata in metadata_dict.items():
-                    normalized_device = {}
-                    for mac, metadata in device_metadata.items():
-                        normalized_mac = mac.lower()
-                        normalized_device[normalized_mac] = metadata
-                    normalized_dict[dev_id] = normalized_device
+    with _write_lock:
+        debug("Saving device metadata")
+        try:
+            # Detect format and normalize
+            if already_normalized:
+                normalized_dict = metadata_dict
+            elif metadata_dict:
+                first_key = next(iter(metadata_dict))
+
+                if _is_uuid(first_key):
+                    # Per-device format (device IDs in canonical UUID form)
+                    normalized_dict = {
+                        _canon_device_id(dev_id): _normalize_macs(device_metadata)
+                        for dev_id, device_metadata in metadata_dict.items()
+                    }
+                else:
+                    # Global format
+                    normalized_dict = _normalize_macs(metadata_dict)
             else:
-                # Global format
                 normalized_dict = {}
-                for mac, metadata in metadata_dict.items():
-                    normalized_mac = mac.lower()
-                    normalized_dict[normalized_mac] = metadata
-        else:
-            normalized_dict = {}
 
-        # Encrypt and save
-        encrypted_data = encrypt_dict(normalized_dict)
-        with open(METADATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(encrypted_data, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
+            # Encrypt and save (temp file + rename, so a crash never leaves a torn file)
+            # The marker goes last so format detection on the first key is unaffected
+            payload = encrypt_blob({**normalized_dict, _NORMALIZED_MARKER: True})
+            atomic_write_bytes(METADATA_FILE, payload, durable=durable, mode=0o600)
+
+            # Update cache.
+            # normalized_dict is built here, except when an already-lowercase legacy
+            # dict is reused as-is - only then copy, so the caller can't alias the cache.
+            # Trusted already-normalized dicts (copy-on-write edits of the cache) are adopted as-is.
+            if normalized_dict is metadata_dict and not already_normalized:
+                normalized_dict = dict(normalized_dict)
+            _metadata_cache = normalized_dict
+            _cache_loaded = True
+
+            debug("Successfully saved metadata")
+            return True
+        except Exception as e:
+            # Drop the cache so the next read goes back to disk (an unsaved edit is discarded)
+            _cache_loaded = False
+            exception(f"Failed to save metadata: {str(e)}")
+            return False
 
-        os.chmod(METADATA_FILE, 0o600)
 
-        # Update cache
-        _metadata_cache = normalized_dict.copy()
-        _cache_loaded = True
+def _writable_cache():
+    """
+    Return the metadata cache, loading it from disk first if needed.
+    Caller must hold _write_lock.
 
-        debug("Successfully saved metadata")
-        return True
-    except Exception as e:
-        exception(f"Failed to save metadata: {str(e)}")
-        return False
+    Returns:
+        dict: The live metadata cache
+    """
+    global _metadata_cache, _cache_loaded
+
+    if not _cache_loaded or _metadata_cache is None:
+        _metadata_cache = load_metadata(use_cache=False)
+        _cache_loaded = True
+    return _metadata_cache
 
 
 def get_device_metadata(mac_address, device_id=None):
@@ -243,22 +361,21 @@ def get_device_metadata(mac_address, device_id=None):
     Returns:
         dict: Metadata dict with 'name', 'comment', 'tags', 'location' keys, or None if not found
     """
-    debug(f"Getting metadata for MAC: {mac_address}, device: {device_id}")
-
+    device_id = _canon_device_id(device_id)
+    # Hot path (per-flow enrichment): read the cache directly, loading only on a miss
+    cache = _metadata_cache if _cache_loaded and _metadata_cache is not None else load_metadata()
     if device_id:
         # Per-device format
-        metadata = load_metadata(device_id=device_id)
+        metadata = cache.get(device_id, {})
     else:
         # Legacy global format
-        metadata = load_metadata()
+        metadata = cache
 
     normalized_mac = mac_address.lower()
 
     result = metadata.get(normalized_mac)
-    if result:
-        debug(f"Found metadata for MAC {normalized_mac}")
-    else:
-        debug(f"No metadata found for MAC {normalized_mac}")
+    if is_debug_enabled():
+        debug("Metadata for MAC %s, device %s: %s", normalized_mac, device_id, 'found' if result else 'not found')
 
     return result
 
@@ -267,6 +384,9 @@ def update_device_metadata(mac_address, name=None, comment=None, tags=None, loca
     """
     Update metadata for a specific MAC address.
     Only provided fields are updated; others remain unchanged.
+    The change is applied to the cache immediately and written to disk by the
+    same request (see save_metadata); a failed write is reported and leaves the
+    cache as it is on disk.
 
     Args:
         mac_address (str): MAC address (will be normalized to lowercase)
@@ -277,121 +397,179 @@ def update_device_metadata(mac_address, name=None, comment=None, tags=None, loca
         device_id (str, optional): Device ID for per-device format. If None, uses legacy global format.
 
     Returns:
-        bool: True on success, False on error
+        bool: True if the update was saved, False on error
     """
-    debug(f"Updating metadata for MAC: {mac_address}, device: {device_id}")
-
-    if device_id:
-        # Per-device format
-        all_metadata = load_metadata(use_cache=False)
-        if device_id not in all_metadata:
-            all_metadata[device_id] = {}
-
-        device_metadata = all_metadata[device_id]
-        normalized_mac = mac_address.lower()
-
-        if normalized_mac not in device_metadata:
-            device_metadata[normalized_mac] = {}
+    device_id = _canon_device_id(device_id)
 
-        # Update fields
-        if name is not None:
-            device_metadata[normalized_mac]['name'] = name
-            debug(f"Updated name to: {name}")
-
-        if comment is not None:
-            device_metadata[normalized_mac]['comment'] = comment
-            debug(f"Updated comment")
-
-        if location is not None:
-            device_metadata[normalized_mac]['location'] = location
-            debug(f"Updated location to: {location}")
-
-        if tags is not None:
-            device_metadata[normalized_mac]['tags'] = [tag.strip() for tag in tags if tag and tag.strip()] if isinstance(tags, list) else []
-            debug(f"Updated tags: {device_metadata[normalized_mac]['tags']}")
-
-        all_metadata[device_id] = device_metadata
-        return save_metadata(all_metadata)
-    else:
-        # Legacy global format
-        metadata = load_metadata()
-        normalized_mac = mac_address.lower()
+    debug(f"Updating metadata for MAC: {mac_address}, device: {device_id}")
+    normalized_mac = sys.intern(mac_address if mac_address.islower() else mac_address.lower())
 
-        if normalized_mac not in metadata:
-            metadata[normalized_mac] = {}
+    with _write_lock:
+        # Copy-on-write so readers holding cached dicts never see a partial edit
+        new_cache = dict(_writable_cache())
+        if device_id:
+            # Per-device format
+            device_metadata = new_cache[device_id] = dict(new_cache.get(device_id, {}))
+        else:
+            # Legacy global format
+            device_metadata = new_cache
+        entry = device_metadata[normalized_mac] = dict(device_metadata.get(normalized_mac, {}))
 
         # Update fields
         if name is not None:
-            metadata[normalized_mac]['name'] = name
+            entry['name'] = name
             debug(f"Updated name to: {name}")
 
         if comment is not None:
-            metadata[normalized_mac]['comment'] = comment
+            entry['comment'] = comment
             debug(f"Updated comment")
 
         if location is not None:
-            metadata[normalized_mac]['location'] = location
+            entry['location'] = location
             debug(f"Updated location to: {location}")
 
         if tags is not None:
-            if isinstance(tags, list):
-                metadata[normalized_mac]['tags'] = [tag.strip() for tag in tags if tag and tag.strip()]
-            else:
-                metadata[normalized_mac]['tags'] = []
-            debug(f"Updated tags: {metadata[normalized_mac]['tags']}")
+            # Strip each tag once and drop empty/non-string values
+            entry['tags'] = [tag for tag in (t.strip() for t in tags if isinstance(t, str)) if tag] if isinstance(tags, list) else []
+            debug(f"Updated tags: {entry['tags']}")
 
-        return save_metadata(metadata)
+        # The cache only ever holds normalized keys, so skip re-normalizing it;
+        # save_metadata installs new_cache as the cache only once it is on disk
+        return save_metadata(new_cache, durable=False, already_normalized=True)
 
 
 def delete_device_metadata(mac_address, device_id=None):
     """
     Remove metadata entry for a specific MAC address.
+    Written to disk before returning (see update_device_metadata).
 
     Args:
         mac_address (str): MAC address (will be normalized to lowercase)
         device_id (str, optional): Device ID for per-device format. If None, uses legacy global format.
 
     Returns:
-        bool: True on success, False on error
+        bool: True if the entry was removed (or was not present), False if saving failed
     """
+    device_id = _canon_device_id(device_id)
+
     debug(f"Deleting metadata for MAC: {mac_address}, device: {device_id}")
+    normalized_mac = mac_address.lower()
 
-    if device_id:
-        # Per-device format
-        all_metadata = load_metadata(use_cache=False)
-        if device_id in all_metadata:
-            device_metadata = all_metadata[device_id]
-            normalized_mac = mac_address.lower()
-
-            if normalized_mac in device_metadata:
-                del device_metadata[normalized_mac]
-                debug(f"Deleted metadata for MAC {normalized_mac} from device {device_id}")
-                all_metadata[device_id] = device_metadata
-                return save_metadata(all_metadata)
-            else:
-                debug(f"No metadata found for MAC {normalized_mac}, nothing to delete")
+    with _write_lock:
+        cache = _writable_cache()
+        if device_id:
+            # Per-device format
+            if device_id not in cache:
+                debug(f"No metadata found for device {device_id}, nothing to delete")
                 return True
+            device_metadata = cache[device_id]
         else:
-            debug(f"No metadata found for device {device_id}, nothing to delete")
-            return True
-    else:
-        # Legacy global format
-        metadata = load_metadata()
-        normalized_mac = mac_address.lower()
+            # Legacy global format
+            device_metadata = cache
 
-        if normalized_mac in metadata:
-            del metadata[normalized_mac]
-            debug(f"Deleted metadata for MAC {normalized_mac}")
-            return save_metadata(metadata)
-        else:
+        if normalized_mac not in device_metadata:
             debug(f"No metadata found for MAC {normalized_mac}, nothing to delete")
             return True
 
+        # Copy-on-write so readers holding cached dicts never see a partial edit
+        new_cache = dict(cache)
+        if device_id:
+            device_metadata = new_cache[device_id] = dict(device_metadata)
+        else:
+            device_metadata = new_cache
+        del device_metadata[normalized_mac]
+        debug(f"Deleted metadata for MAC {normalized_mac}" + (f" from device {device_id}" if device_id else ""))
+
+        # The cache only ever holds normalized keys, so skip re-normalizing it;
+        # save_metadata installs new_cache as the cache only once it is on disk
+        return save_metadata(new_cache, durable=False, already_normalized=True)
+
+
+def _device_value_index(device_id, device_metadata):
+    """
+    Get the (tags, locations) sets for one device, rescanning only if its metadata changed.
+
+    Args:
+        device_id: Device ID (None for legacy global format)
+        device_metadata (dict): {mac: metadata} for the device
+
+    Returns:
+        tuple: (set of tags, set of locations)
+    """
+    entry = _value_index.get(device_id)
+    if entry is not None and entry[0] is device_metadata:
+        return entry[1], entry[2]
+
+    tags = set()
+    locations = set()
+    for device_meta in device_metadata.values():
+        device_tags = device_meta.get('tags')
+        if device_tags:
+            tags.update(device_tags)
+        location = device_meta.get('location')
+        if location:
+            location = location.strip()
+            if location:
+                locations.add(location)
+
+    _value_index[device_id] = (device_metadata, tags, locations)
+    return tags, locations
+
+
+def _collect_values(device_id, position):
+    """
+    Union the indexed tag (position 0) or location (position 1) sets.
+
+    Args:
+        device_id (str, optional): Limit to one device. If None, covers all devices.
+        position (int): 0 for tags, 1 for locations
+
+    Returns:
+        set: Unique values
+    """
+    device_id = _canon_device_id(device_id)
+    metadata = load_metadata(device_id=device_id, use_cache=True)  # Use cache for performance
+    if device_id:
+        return _device_value_index(device_id, metadata)[position]
+
+    # Per-device format {device_id: {mac: metadata}} when the first key is a UUID,
+    # otherwise legacy global format {mac: metadata}
+    if metadata and _is_uuid(next(iter(metadata))):
+        values = set()
+        for dev_id, device_metadata in metadata.items():
+            values |= _device_value_index(dev_id, device_metadata)[position]
+        return values
+    return _device_value_index(None, metadata)[position]
+
+
+def _sorted_values(device_id, position):
+    """
+    Get the sorted tag (position 0) or location (position 1) list, reusing the
+    last result while the metadata cache is unchanged.
+
+    Args:
+        device_id (str, optional): Limit to one device. If None, covers all devices.
+        position (int): 0 for tags, 1 for locations
+
+    Returns:
+        list: Sorted unique values (a fresh list the caller may modify)
+    """
+    device_id = _canon_device_id(device_id)
+    key = (device_id, position)
+    entry = _sorted_values_cache.get(key)
+    if entry is not None and _cache_loaded and entry[0] is _metadata_cache:
+        return list(entry[1])
+
+    values = sorted(_collect_values(device_id, position))
+    if _cache_loaded and _metadata_cache is not None:
+        _sorted_values_cache[key] = (_metadata_cache, values)
+    return list(values)
+
 
 def get_all_tags(device_id=None):
     """
     Get a list of all unique tags across all devices.
-    Uses cached metadata if available.
+    Uses cached metadata and the per-device tag index.
 
     Args:
         device_id (str, optional): Device ID for per-device format. If None, gets tags from all devices.
@@ -400,31 +578,14 @@ def get_all_tags(device_id=None):
         list: Sorted list of unique tag strings
     """
     debug(f"Getting all unique tags for device: {device_id}")
-    metadata = load_metadata(device_id=device_id, use_cache=True)  # Use cache for performance
-    all_tags = set()
-
-    # Check if this is per-device format
-    if metadata and any(isinstance(v, dict) and any(isinstance(vv, dict) for vv in v.values()) for v in metadata.values() if isinstance(v, dict)):
-        # Per-device format: {device_id: {mac: metadata}}
-        for dev_id, device_metadata in metadata.items():
-            if isinstance(device_metadata, dict):
-                for mac, device_meta in device_metadata.items():
-                    if isinstance(device_meta, dict) and 'tags' in device_meta and isinstance(device_meta['tags'], list):
-                        all_tags.update(device_meta['tags'])
-    else:
-        # Legacy global format: {mac: metadata}
-        for mac, device_meta in metadata.items():
-            if isinstance(device_meta, dict) and 'tags' in device_meta and isinstance(device_meta['tags'], list):
-                all_tags.update(device_meta['tags'])
-
-    unique_tags = sorted(list(all_tags))
+    unique_tags = _sorted_values(device_id, 0)
     debug(f"Found {len(unique_tags)} unique tags")
     return unique_tags
 
 def get_all_locations(device_id=None):
     """
     Get a list of all unique locations across all devices.
-    Uses cached metadata if available.
+    Uses cached metadata and the per-device location index.
 
     Args:
         device_id (str, optional): Device ID for per-device format. If None, gets locations from all devices.
@@ -433,41 +594,32 @@ def get_all_locations(device_id=None):
         list: Sorted list of unique location strings
     """
     debug(f"Getting all unique locations for device: {device_id}")
-    metadata = load_metadata(device_id=device_id, use_cache=True)  # Use cache for performance
-    all_locations = set()
-
-    # Check if this is per-device format
-    if metadata and any(isinstance(v, dict) and any(isinstance(vv, dict) for vv in v.values()) for v in metadata.values() if isinstance(v, dict)):
-        # Per-device format: {device_id: {mac: metadata}}
-        for dev_id, device_metadata in metadata.items():
-            if isinstance(device_metadata, dict):
-                for mac, device_meta in device_metadata.items():
-                    if isinstance(device_meta, dict) and 'location' in device_meta and device_meta['location']:
-                        location = device_meta['location'].strip()
-                        if location:
-                            all_locations.add(location)
-    else:
-        # Legacy global format: {mac: metadata}
-        for mac, device_meta in metadata.items():
-            if isinstance(device_meta, dict) and 'location' in device_meta and device_meta['location']:
-                location = device_meta['location'].strip()
-                if location:
-                    all_locations.add(location)
-
-    unique_locations = sorted(list(all_locations))
+    unique_locations = _sorted_values(device_id, 1)
     debug(f"Found {len(unique_locations)} unique locations")
     return unique_locations
 
 def reload_metadata_cache():
     """
-    Force reload metadata from disk, updating the global cache.
+    Invalidate the metadata cache so the next read reloads it from disk.
     Call this when you know metadata has been modified externally.
+    """
+    global _cache_loaded, _metadata_cache
+
+    with _write_lock:
+        _cache_loaded = False
+        _metadata_cache = None
+        _value_index.clear()
+        _sorted_values_cache.clear()
+
+
+def force_reload_metadata():
+    """
+    Reload metadata from disk immediately, updating the global cache.
 
     Returns:
         dict: Reloaded metadata dictionary
     """
-    global _cache_loaded
-    _cache_loaded = False  # Force reload
+    reload_metadata_cache()
     return load_metadata(use_cache=False)
 
 
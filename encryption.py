@@ -7,12 +7,33 @@ Uses Fernet symmetric encryption (AES 128 in CBC mode with HMAC for authenticati
 
 import os
 import base64
+import json
 from cryptography.fernet import Fernet
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Encryption key file location
 KEY_FILE = 'encryption.key'
 
+# Key bytes, keyed by KEY_FILE's (st_mtime_ns, st_size), and the Fernet instance built
+# from them - another process (e.g. a backup restore) may replace the shared key file
+_KEY_BYTES = None
+_KEY_STAT = None
+_CIPHER = None
+_CIPHER_KEY = None
+
+# Prefix marking a whole-payload Fernet token written by encrypt_blob
+BLOB_PREFIX = b'PFM1:'
+
+# base64('gAAAAA'): every value from encrypt_string starts with this
+_ENCRYPTED_PREFIX = 'Z0FBQUFB'
+# len(base64(token)) for the shortest (one-block) Fernet token
+_MIN_ENCRYPTED_LENGTH = 136
+
 
 def generate_key():
     """
@@ -28,6 +49,8 @@ def generate_key():
         debug("generate_key called - creating new encryption key")
     except:
         pass
+    global _KEY_BYTES, _KEY_STAT
+
     key = Fernet.generate_key()
 
     try:
@@ -36,9 +59,12 @@ def generate_key():
 
         # Set file permissions to 600 (owner read/write only)
         os.chmod(KEY_FILE, 0o600)
+        st = os.stat(KEY_FILE)
     except Exception as e:
         raise Exception(f"Failed to save encryption key: {e}")
 
+    _KEY_BYTES = key
+    _KEY_STAT = (st.st_mtime_ns, st.st_size)
     return key
 
 
@@ -55,13 +81,15 @@ def check_key_permissions():
         debug("check_key_permissions called for %s", KEY_FILE)
     except:
         pass
-    if not os.path.exists(KEY_FILE):
-        return True  # File doesn't exist yet, will be created with correct permissions
-
     try:
-        # Get current permissions
+        # Get current permissions (one stat covers existence too)
         current_permissions = os.stat(KEY_FILE).st_mode & 0o777
+    except FileNotFoundError:
+        return True  # File doesn't exist yet, will be created with correct permissions
+    except Exception:
+        return False
 
+    try:
         # Check if permissions are too permissive (not 600)
         if current_permissions != 0o600:
             # Fix permissions
@@ -77,44 +105,97 @@ def load_key():
     """
     Load the encryption key from file.
     If the key file doesn't exist, generate a new one.
-    Verifies/fixes file permissions on load.
+    Verifies/fixes file permissions on load. The key is cached and only
+    re-read when the file's mtime/size changes.
 
     Returns:
         bytes: The encryption key
     """
+    global _KEY_BYTES, _KEY_STAT
+
+    try:
+        st = os.stat(KEY_FILE)
+    except FileNotFoundError:
+        return generate_key()
+    except Exception as e:
+        raise Exception(f"Failed to load encryption key: {e}")
+
+    if _KEY_BYTES is not None and _KEY_STAT == (st.st_mtime_ns, st.st_size):
+        return _KEY_BYTES
+
     try:
         from logger import debug
         debug("load_key called for %s", KEY_FILE)
     except:
         pass
-    if not os.path.exists(KEY_FILE):
-        return generate_key()
-
-    # Check and fix permissions if needed
-    check_key_permissions()
-
     try:
         with open(KEY_FILE, 'rb') as key_file:
+            # Check and fix permissions if needed (fstat on the open file, no extra lookups)
+            st = os.fstat(key_file.fileno())
+            if st.st_mode & 0o777 != 0o600:
+                try:
+                    os.chmod(KEY_FILE, 0o600)
+                except OSError:
+                    pass
             key = key_file.read()
-        return key
+    except FileNotFoundError:
+        return generate_key()
     except Exception as e:
         raise Exception(f"Failed to load encryption key: {e}")
 
+    _KEY_BYTES = key
+    _KEY_STAT = (st.st_mtime_ns, st.st_size)
+    return key
+
 
 def get_cipher():
     """
-    Get a Fernet cipher instance using the loaded key.
+    Get the Fernet cipher instance for the loaded key.
+    Reused until the key file changes or invalidate_cipher_cache() is called.
 
     Returns:
         Fernet: Cipher instance for encryption/decryption
     """
-    try:
-        from logger import debug
-        debug("get_cipher called")
-    except:
-        pass
+    global _CIPHER, _CIPHER_KEY
+
     key = load_key()
-    return Fernet(key)
+    if _CIPHER is None or key != _CIPHER_KEY:
+        try:
+            from logger import debug
+            debug("get_cipher creating Fernet instance")
+        except:
+            pass
+        _CIPHER = Fernet(key)
+        _CIPHER_KEY = key
+    return _CIPHER
+
+
+def invalidate_cipher_cache():
+    """
+    Drop the cached key and cipher so the next use re-reads KEY_FILE.
+    Changes to the file are also picked up on their own; this covers a
+    replacement with the same mtime and size.
+    """
+    global _KEY_BYTES, _KEY_STAT, _CIPHER, _CIPHER_KEY
+
+    _KEY_BYTES = None
+    _KEY_STAT = None
+    _CIPHER = None
+    _CIPHER_KEY = None
+
+
+def _encrypt_with(cipher, plaintext):
+    """Encrypt one string with an already-built cipher (empty stays empty)."""
+    if not plaintext:
+        return ""
+    return base64.b64encode(cipher.encrypt(plaintext.encode('utf-8'))).decode('utf-8')
+
+
+def _decrypt_with(cipher, encrypted_text):
+    """Decrypt one string with an already-built cipher (empty stays empty)."""
+    if not encrypted_text:
+        return ""
+    return cipher.decrypt(base64.b64decode(encrypted_text.encode('utf-8'))).decode('utf-8')
 
 
 def encrypt_string(plaintext):
@@ -134,10 +215,7 @@ def encrypt_string(plaintext):
         return ""
 
     try:
-        cipher = get_cipher()
-        encrypted_bytes = cipher.encrypt(plaintext.encode('utf-8'))
-        encrypted_string = base64.b64encode(encrypted_bytes).decode('utf-8')
-        return encrypted_string
+        return _encrypt_with(get_cipher(), plaintext)
     except Exception as e:
         # Log the error (import logger only when needed to avoid circular deps)
         try:
@@ -166,11 +244,7 @@ def decrypt_string(encrypted_text):
         return ""
 
     try:
-        cipher = get_cipher()
-        encrypted_bytes = base64.b64decode(encrypted_text.encode('utf-8'))
-        decrypted_bytes = cipher.decrypt(encrypted_bytes)
-        decrypted_string = decrypted_bytes.decode('utf-8')
-        return decrypted_string
+        return _decrypt_with(get_cipher(), encrypted_text)
     except Exception as e:
         # Log the error (import logger only when needed to avoid circular deps)
         try:
@@ -181,9 +255,81 @@ def decrypt_string(encrypted_text):
         raise Exception(f"Decryption failed: {str(e)}")
 
 
+def encrypt_blob(obj):
+    """
+    Serialize an object to JSON and encrypt it as a single Fernet token.
+    For data that is always loaded and saved in full, one token is much smaller
+    and cheaper than encrypt_dict's per-value tokens.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        bytes: BLOB_PREFIX followed by the Fernet token
+
+    Raises:
+        Exception: If encryption fails
+    """
+    try:
+        # Compact encoding: the blob is never read by hand
+        if orjson is not None:
+            plaintext = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            plaintext = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        return BLOB_PREFIX + get_cipher().encrypt(plaintext)
+    except Exception as e:
+        try:
+            from logger import error
+            error(f"Failed to encrypt blob: {str(e)}")
+        except:
+            pass
+        raise Exception(f"Encryption failed: {str(e)}")
+
+
+def decrypt_blob(payload):
+    """
+    Decrypt a payload written by encrypt_blob and parse the JSON inside.
+
+    Args:
+        payload (bytes): BLOB_PREFIX followed by a Fernet token
+
+    Returns:
+        Decrypted object
+
+    Raises:
+        Exception: If the payload is not a blob or decryption fails
+    """
+    if not is_encrypted_blob(payload):
+        raise Exception("Decryption failed: payload is not an encrypted blob")
+
+    try:
+        plaintext = get_cipher().decrypt(payload[len(BLOB_PREFIX):])
+        return orjson.loads(plaintext) if orjson is not None else json.loads(plaintext)
+    except Exception as e:
+        try:
+            from logger import error
+            error(f"Failed to decrypt blob: {str(e)}")
+        except:
+            pass
+        raise Exception(f"Decryption failed: {str(e)}")
+
+
+def is_encrypted_blob(payload):
+    """
+    Check if raw file bytes were written by encrypt_blob.
+
+    Args:
+        payload (bytes): Raw file content
+
+    Returns:
+        bool: True if payload starts with BLOB_PREFIX
+    """
+    return isinstance(payload, bytes) and payload.startswith(BLOB_PREFIX)
+
+
 def encrypt_dict(data_dict):
     """
-    Encrypt all string values in a dictionary (recursive).
+    Encrypt all string values in a dictionary, including nested dicts.
     Non-string values are left unchanged.
 
     Args:
@@ -195,30 +341,64 @@ def encrypt_dict(data_dict):
     if not isinstance(data_dict, dict):
         return data_dict
 
-    encrypted_dict = {}
+    try:
+        cipher = get_cipher()
+        return _map_strings(data_dict, lambda value: _encrypt_with(cipher, value))
+    except Exception as e:
+        try:
+            from logger import error
+            error(f"Failed to encrypt string: {str(e)}")
+        except:
+            pass
+        raise Exception(f"Encryption failed: {str(e)}")
 
-    for key, value in data_dict.items():
-        if isinstance(value, str):
-            encrypted_dict[key] = encrypt_string(value)
-        elif isinstance(value, dict):
-            encrypted_dict[key] = encrypt_dict(value)
-        elif isinstance(value, list):
-            encrypted_dict[key] = [
-                encrypt_dict(item) if isinstance(item, dict)
-                else encrypt_string(item) if isinstance(item, str)
-                else item
-                for item in value
-            ]
-        else:
-            # Numbers, booleans, None, etc. are not encrypted
-            encrypted_dict[key] = value
 
-    return encrypted_dict
+def _map_strings(data_dict, transform):
+    """
+    Copy a nested dict, passing every string value (including strings directly
+    inside lists) through transform. Dicts inside dicts and lists are walked with
+    an explicit stack rather than recursion; other values are copied unchanged.
+
+    Args:
+        data_dict (dict): Dictionary to copy
+        transform (callable): Function applied to each string value
+
+    Returns:
+        dict: Transformed copy
+    """
+    result = {}
+    stack = [(data_dict, result)]
+
+    while stack:
+        source, target = stack.pop()
+        for key, value in source.items():
+            if isinstance(value, str):
+                target[key] = transform(value)
+            elif isinstance(value, dict):
+                child = target[key] = {}
+                stack.append((value, child))
+            elif isinstance(value, list):
+                items = []
+                for item in value:
+                    if isinstance(item, dict):
+                        child = {}
+                        stack.append((item, child))
+                        items.append(child)
+                    elif isinstance(item, str):
+                        items.append(transform(item))
+                    else:
+                        items.append(item)
+                target[key] = items
+            else:
+                # Numbers, booleans, None, etc. are not encrypted
+                target[key] = value
+
+    return result
 
 
 def decrypt_dict(encrypted_dict):
     """
-    Decrypt all string values in a dictionary (recursive).
+    Decrypt all string values in a dictionary, including nested dicts.
     Non-string values are left unchanged.
 
     Args:
@@ -230,30 +410,20 @@ def decrypt_dict(encrypted_dict):
     if not isinstance(encrypted_dict, dict):
         return encrypted_dict
 
-    decrypted_dict = {}
-
-    for key, value in encrypted_dict.items():
-        if isinstance(value, str):
-            # Only decrypt if the value appears to be encrypted
-            if is_encrypted(value):
-                decrypted_dict[key] = decrypt_string(value)
-            else:
-                # Not encrypted (e.g., bcrypt hash), leave as-is
-                decrypted_dict[key] = value
-        elif isinstance(value, dict):
-            decrypted_dict[key] = decrypt_dict(value)
-        elif isinstance(value, list):
-            decrypted_dict[key] = [
-                decrypt_dict(item) if isinstance(item, dict)
-                else decrypt_string(item) if (isinstance(item, str) and is_encrypted(item))
-                else item
-                for item in value
-            ]
-        else:
-            # Numbers, booleans, None, etc. are not encrypted
-            decrypted_dict[key] = value
-
-    return decrypted_dict
+    try:
+        cipher = get_cipher()
+        # Only decrypt values that appear encrypted (e.g. bcrypt hashes are left as-is)
+        return _map_strings(
+            encrypted_dict,
+            lambda value: _decrypt_with(cipher, value) if is_encrypted(value) else value
+        )
+    except Exception as e:
+        try:
+            from logger import error
+            error(f"Failed to decrypt string: {str(e)}")
+        except:
+            pass
+        raise Exception(f"Decryption failed: {str(e)}")
 
 
 def is_encrypted(value):
@@ -267,11 +437,6 @@ def is_encrypted(value):
     Returns:
         bool: True if the value appears to be Fernet-encrypted, False otherwise
     """
-    try:
-        from logger import debug
-        debug("is_encrypted called for value of length: %d", len(value) if value else 0)
-    except:
-        pass
     if not isinstance(value, str) or not value:
         return False
 
@@ -279,20 +444,11 @@ def is_encrypted(value):
     if value.startswith(('$2b$', '$2a$', '$2y$')):
         return False
 
-    try:
-        # Encrypted values should be base64-encoded
-        decoded = base64.b64decode(value.encode('utf-8'))
-        # Fernet tokens MUST start with 'gAAAAA' (version byte 0x80) after base64 decoding
-        # This is the Fernet token format signature
-        is_fernet = decoded.startswith(b'gAAAAA')
-        if is_fernet:
-            try:
-                debug(f"Value appears to be Fernet-encrypted (starts with gAAAAA, length {len(value)})")
-            except:
-                pass
-        return is_fernet
-    except Exception:
-        return False
+    # Stored values are base64 of a Fernet token, and Fernet tokens always start
+    # with 'gAAAAA' (version byte 0x80), so the stored form always starts with
+    # base64('gAAAAA') - no decoding needed. The shortest token is 136 characters
+    # once wrapped, and padded base64 is always a multiple of 4 long.
+    return len(value) >= _MIN_ENCRYPTED_LENGTH and len(value) % 4 == 0 and value.startswith(_ENCRYPTED_PREFIX)
 
 
 def migrate_unencrypted_data(data_dict):
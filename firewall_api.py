@@ -12,94 +12,133 @@ Individual functions are organized into specialized modules:
 - firewall_api_dhcp.py: DHCP server management
 """
 import xml.etree.ElementTree as ET
+import importlib
+import os
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from config import load_settings, DEFAULT_FIREWALL_IP, DEFAULT_API_KEY
+from config import load_settings, DEFAULT_FIREWALL_IP, DEFAULT_API_KEY, SETTINGS_FILE, DEVICES_FILE
 from utils import api_request_get, get_api_stats
-from logger import debug, info, warning, error, exception
-from device_manager import device_manager
-
-# Import functions from specialized modules
-from firewall_api_logs import (
-    get_system_logs,
-    get_threat_stats,
-    get_traffic_logs
-)
-from firewall_api_applications import (
-    get_top_applications,
-    get_application_statistics
-)
-from firewall_api_health import (
-    check_firewall_health,
-    get_software_updates,
-    get_license_info
-)
-from firewall_api_mac import (
-    is_virtual_mac,
-    lookup_mac_vendor
-)
-from firewall_api_network import (
-    get_interface_zones,
-    get_interface_info
-)
-from firewall_api_devices import (
-    get_dhcp_leases,
-    get_connected_devices,
-    generate_tech_support_file,
-    check_tech_support_job_status,
-    get_tech_support_file_url
-)
-from firewall_api_upgrades import (
-    check_available_panos_versions,
-    download_panos_version,
-    install_panos_version,
-    check_job_status,
-    reboot_firewall
-)
-from firewall_api_content import (
-    check_content_updates,
-    download_content_update,
-    install_content_update,
-    check_all_content_updates
-)
-from firewall_api_dhcp import (
-    get_dhcp_servers,
-    get_dhcp_leases_detailed,
-    get_dhcp_summary
-)
-from firewall_api_metrics import (
-    get_system_resources,
-    get_interface_stats,
-    get_interface_traffic_counters,
-    get_session_count,
-    get_cpu_temperature
-)
-from firewall_api_applications import (
-    get_top_applications,
-    get_application_statistics
-)
-from firewall_api_throughput import (
-    get_throughput_data,
-    get_wan_interface_ip
-)
+from logger import debug, info, warning, error, exception, is_debug_enabled
+from device_manager import get_device_manager
+
+# Optional C-accelerated XML parsing for firewall responses (stdlib ElementTree fallback)
+# Parser is hardened the same way as defusedxml: no entity expansion, no network access
+try:
+    from lxml import etree as lxml_etree
+    _LXML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+    # Both <show><system><info> fields in one compiled, rooted (non-descendant) query
+    _SYSINFO_XPATH = lxml_etree.XPath('/response/result/system/uptime | /response/result/system/sw-version')
+except ImportError:
+    lxml_etree = None
+
+# Functions from specialized modules, imported on first use (PEP 562) so that
+# importing firewall_api for get_firewall_config doesn't load every submodule
+_LAZY_EXPORTS = {
+    'get_system_logs': 'firewall_api_logs',
+    'get_threat_stats': 'firewall_api_logs',
+    'get_traffic_logs': 'firewall_api_logs',
+    'get_top_applications': 'firewall_api_applications',
+    'get_application_statistics': 'firewall_api_applications',
+    'check_firewall_health': 'firewall_api_health',
+    'get_software_updates': 'firewall_api_health',
+    'get_license_info': 'firewall_api_health',
+    'is_virtual_mac': 'firewall_api_mac',
+    'lookup_mac_vendor': 'firewall_api_mac',
+    'get_interface_zones': 'firewall_api_network',
+    'get_interface_info': 'firewall_api_network',
+    'get_dhcp_leases': 'firewall_api_devices',
+    'get_connected_devices': 'firewall_api_devices',
+    'generate_tech_support_file': 'firewall_api_devices',
+    'check_tech_support_job_status': 'firewall_api_devices',
+    'get_tech_support_file_url': 'firewall_api_devices',
+    'check_available_panos_versions': 'firewall_api_upgrades',
+    'download_panos_version': 'firewall_api_upgrades',
+    'install_panos_version': 'firewall_api_upgrades',
+    'check_job_status': 'firewall_api_upgrades',
+    'reboot_firewall': 'firewall_api_upgrades',
+    'check_content_updates': 'firewall_api_content',
+    'download_content_update': 'firewall_api_content',
+    'install_content_update': 'firewall_api_content',
+    'check_all_content_updates': 'firewall_api_content',
+    'get_dhcp_servers': 'firewall_api_dhcp',
+    'get_dhcp_leases_detailed': 'firewall_api_dhcp',
+    'get_dhcp_summary': 'firewall_api_dhcp',
+    'get_system_resources': 'firewall_api_metrics',
+    'get_interface_stats': 'firewall_api_metrics',
+    'get_interface_traffic_counters': 'firewall_api_metrics',
+    'get_session_count': 'firewall_api_metrics',
+    'get_cpu_temperature': 'firewall_api_metrics',
+    'get_throughput_data': 'firewall_api_throughput',
+    'get_wan_interface_ip': 'firewall_api_throughput',
+}
+
+
+def __getattr__(name):
+    """Import a re-exported submodule function on first access and cache it here"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported functions in dir(firewall_api)"""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+# Resolved configs keyed by device_id, stored with the (settings, devices) file
+# stat keys they were built from; any save to either file changes the key.
+_firewall_config_cache = {}
+
+
+def _config_files_key():
+    """(st_mtime_ns, st_size) of settings.json and devices.json (None if missing)"""
+    key = []
+    for path in (SETTINGS_FILE, DEVICES_FILE):
+        try:
+            st = os.stat(path)
+            key.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            key.append(None)
+    return tuple(key)
 
 
 def get_firewall_config(device_id=None):
     """Get firewall IP and API key from settings or from a specific device
 
+    Results are cached until settings.json or devices.json changes on disk,
+    which also covers saves made by other processes.
+
     Returns:
         tuple: (firewall_ip, api_key, base_url) or (None, None, None) if no device configured
     """
+    files_key = _config_files_key()
+    cached = _firewall_config_cache.get(device_id)
+    if cached is not None and cached[0] == files_key:
+        return cached[1]
+
+    config = _resolve_firewall_config(device_id)
+    _firewall_config_cache[device_id] = (files_key, config)
+    return config
+
+
+def _resolve_firewall_config(device_id):
+    """Uncached body of get_firewall_config"""
     debug("get_firewall_config called with device_id: %s", device_id)
 
     if device_id:
         # Get configuration for a specific device
-        device = device_manager.get_device(device_id)
+        device = get_device_manager().get_device(device_id)
         if device:
             firewall_ip = device['ip']
             api_key = device['api_key']
-            debug(f"get_firewall_config: Using device {device.get('name')} - API key starts with: {api_key[:20] if api_key else 'NONE'}...")
+            if is_debug_enabled():
+                debug("get_firewall_config: Using device %s - API key starts with: %s...",
+                      device.get('name'), api_key[:20] if api_key else 'NONE')
             base_url = f"https://{firewall_ip}/api/"
             return firewall_ip, api_key, base_url
 
@@ -107,16 +146,20 @@ def get_firewall_config(device_id=None):
     settings = load_settings()
     firewall_ip = settings.get('firewall_ip', DEFAULT_FIREWALL_IP)
     api_key = settings.get('api_key', DEFAULT_API_KEY)
-    debug(f"get_firewall_config: Loaded from settings - firewall_ip={firewall_ip}, API key starts with: {api_key[:20] if api_key else 'NONE'}...")
+    if is_debug_enabled():
+        debug("get_firewall_config: Loaded from settings - firewall_ip=%s, API key starts with: %s...",
+              firewall_ip, api_key[:20] if api_key else 'NONE')
 
     # Check if we have a selected device in settings
     selected_device_id = settings.get('selected_device_id')
     if selected_device_id:
-        device = device_manager.get_device(selected_device_id)
+        device = get_device_manager().get_device(selected_device_id)
         if device and device.get('enabled', True):
             firewall_ip = device['ip']
             api_key = device['api_key']
-            debug(f"get_firewall_config: Using selected device {device.get('name')} - API key starts with: {api_key[:20] if api_key else 'NONE'}...")
+            if is_debug_enabled():
+                debug("get_firewall_config: Using selected device %s - API key starts with: %s...",
+                      device.get('name'), api_key[:20] if api_key else 'NONE')
 
     # If no device is configured or selected, return None values
     if not firewall_ip or not api_key:
@@ -124,7 +167,8 @@ def get_firewall_config(device_id=None):
         return None, None, None
 
     base_url = f"https://{firewall_ip}/api/"
-    debug(f"get_firewall_config: Final API key starts with: {api_key[:20] if api_key else 'NONE'}...")
+    if is_debug_enabled():
+        debug("get_firewall_config: Final API key starts with: %s...", api_key[:20] if api_key else 'NONE')
     return firewall_ip, api_key, base_url
 
 
@@ -157,15 +201,23 @@ def get_device_system_info(device_id):
         # Reduced timeout from 5s to 2s (healthy firewalls respond in <1s)
         response = api_request_get(base_url, params=params, verify=False, timeout=2)
         if response.status_code == 200:
-            root = ET.fromstring(response.text)
-
-            # Extract both uptime and version from single response
-            uptime_elem = root.find('.//uptime')
-            version_elem = root.find('.//sw-version')
+            # Extract both uptime and version from single response (raw bytes, no text decode)
+            if lxml_etree is not None:
+                root = lxml_etree.fromstring(response.content, parser=_LXML_PARSER)
+                # Reversed so the first match in document order wins
+                fields = {elem.tag: elem.text for elem in reversed(_SYSINFO_XPATH(root))}
+            else:
+                root = ET.fromstring(response.content)
+                uptime_elem = root.find('.//uptime')
+                version_elem = root.find('.//sw-version')
+                fields = {
+                    'uptime': uptime_elem.text if uptime_elem is not None else None,
+                    'sw-version': version_elem.text if version_elem is not None else None
+                }
 
             return {
-                'uptime': uptime_elem.text if uptime_elem is not None and uptime_elem.text else None,
-                'version': version_elem.text if version_elem is not None and version_elem.text else None
+                'uptime': fields.get('uptime') or None,
+                'version': fields.get('sw-version') or None
             }
 
         return {'uptime': None, 'version': None}
@@ -174,6 +226,28 @@ def get_device_system_info(device_id):
         return {'uptime': None, 'version': None}
 
 
+def get_device_system_info_many(device_ids, max_workers=5):
+    """Fetch uptime and version for several devices concurrently
+
+    Requests are network-bound (the GIL is released while waiting), so a small
+    thread pool turns N sequential round trips into roughly one.
+
+    Args:
+        device_ids: Iterable of device UUIDs
+        max_workers: Maximum concurrent firewall requests (default 5, per API limit)
+
+    Returns:
+        dict: {device_id: {'uptime': str or None, 'version': str or None}}
+    """
+    device_ids = list(device_ids)
+    if not device_ids:
+        return {}
+
+    # get_device_system_info never raises, so map() always yields one result per ID
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(device_ids))) as executor:
+        return dict(zip(device_ids, executor.map(get_device_system_info, device_ids)))
+
+
 def get_device_uptime(device_id):
     """Fetch uptime for a specific device
 
@@ -199,6 +273,7 @@ __all__ = [
     # Core functions (defined in this module)
     'get_firewall_config',
     'get_device_system_info',  # OPTIMIZED: Combined uptime + version
+    'get_device_system_info_many',  # Concurrent get_device_system_info for several devices
     'get_device_uptime',  # DEPRECATED: Use get_device_system_info()
     'get_device_version',  # DEPRECATED: Use get_device_system_info()
     # Re-exported from firewall_api_metrics
@@ -8,59 +8,81 @@ Enterprise-level improvements (v2.0+):
 - Database-first architecture (TimescaleDB)
 """
 import xml.etree.ElementTree as ET
+import heapq
+import re
+import socket
 import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from operator import itemgetter
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Any
 from utils import api_request_get
 from logger import debug, exception
-from firewall_api_logs import get_traffic_logs
+from firewall_api_logs import iter_traffic_logs
 from firewall_api_devices import get_dhcp_leases, get_connected_devices
 from config import APPLICATION_SETTINGS
 
+# Optional: faster C-level XML parsing (falls back to xml.etree)
+# Parsers are hardened the same way as defusedxml: no entity expansion, no network access
+try:
+    from lxml import etree as lxml_etree
+    _LXML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+except ImportError:
+    lxml_etree = None
 
+
+# Numeric ".<id>" suffix of a sub-interface or vlan interface name
+_VLAN_SUFFIX_RE = re.compile(r'\.(\d+)\Z')
+
+# Zone names that mark traffic as leaving the network
+_EXTERNAL_ZONES = frozenset(('untrust', 'internet', 'external'))
+
+# Top applications log job polling (seconds): first wait, backoff cap, how long an
+# unfinished job is polled (the old fixed wait) and the overall limit, which is that
+# window plus one 10s request - the old worst case
+TOP_APPS_POLL_INITIAL_DELAY = 0.05
+TOP_APPS_POLL_MAX_DELAY = 0.5
+TOP_APPS_POLL_WINDOW = 1.0
+TOP_APPS_POLL_TIMEOUT = 11
+
+# (network, mask) pairs for the private/non-routable IPv4 ranges, as 32-bit integers
+_PRIVATE_NETWORKS = (
+    (0x0A000000, 0xFF000000),  # 10.0.0.0/8 (Class A private network)
+    (0xAC100000, 0xFFF00000),  # 172.16.0.0/12 (Class B private network)
+    (0xC0A80000, 0xFFFF0000),  # 192.168.0.0/16 (Class C private network)
+    (0x7F000000, 0xFF000000),  # Loopback 127.0.0.0/8
+    (0xA9FE0000, 0xFFFF0000),  # Link-local 169.254.0.0/16
+)
+
+
+@lru_cache(maxsize=131072)
 def is_private_ip(ip: str) -> bool:
     """
     Check if an IP address is a private (RFC 1918) address.
 
+    Results are memoized: traffic logs repeat the same LAN addresses heavily.
+
     Args:
         ip: IP address string (e.g., "192.168.1.1")
 
     Returns:
         bool: True if IP is private, False otherwise
     """
-    if not ip or ip == 'N/A' or ip == '':
+    if not ip or ip == 'N/A' or ip.count('.') != 3:
         return False
 
+    # Strict dotted-quad parse: inet_aton would accept octal/hex octets and trailing junk
     try:
-        parts = ip.split('.')
-        if len(parts) != 4:
-            return False
-
-        first = int(parts[0])
-        second = int(parts[1])
-
-        # 10.0.0.0/8 (Class A private network)
-        if first == 10:
-            return True
-
-        # 172.16.0.0/12 (Class B private network)
-        if first == 172 and 16 <= second <= 31:
-            return True
-
-        # 192.168.0.0/16 (Class C private network)
-        if first == 192 and second == 168:
-            return True
-
-        # Loopback 127.0.0.0/8
-        if first == 127:
-            return True
+        n = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+    except (OSError, TypeError, ValueError):
+        return False
 
-        # Link-local 169.254.0.0/16
-        if first == 169 and second == 254:
+    for network, mask in _PRIVATE_NETWORKS:
+        if n & mask == network:
             return True
-
-        return False
-    except (ValueError, IndexError):
-        return False
+    return False
 
 
 def classify_traffic_direction(sources, destinations, zones, category):
@@ -82,75 +104,154 @@ def classify_traffic_direction(sources, destinations, zones, category):
         str: "internet", "local", "mixed", or "unknown"
     """
     # Strategy 1: Use security zones if available
-    if zones and len(zones) > 0:
-        zone_set = set(z.lower() for z in zones if z)
-
-        # Check for typical zone patterns
-        has_untrust = 'untrust' in zone_set or 'internet' in zone_set or 'external' in zone_set
-        has_trust_only = 'trust' in zone_set and len(zone_set) == 1
-
-        if has_untrust:
-            # Traffic involving untrust zone = internet traffic
-            return 'internet'
-        elif has_trust_only:
-            # Traffic entirely within trust zone = local traffic
-            return 'local'
-        elif len(zone_set) > 1:
-            # Multiple zones (not just untrust) = mixed
-            return 'mixed'
+    if zones:
+        zone_direction = _classify_zones(frozenset(zones))
+        if zone_direction is not None:
+            return zone_direction
 
     # Strategy 2: Analyze source and destination IPs
-    if sources or destinations:
-        has_private_src = False
-        has_public_src = False
-        has_private_dst = False
-        has_public_dst = False
-
-        # Check sources
-        for src in sources:
-            src_ip = src.get('ip', '')
-            if src_ip and src_ip != 'N/A':
-                if is_private_ip(src_ip):
-                    has_private_src = True
-                else:
-                    has_public_src = True
-
-        # Check destinations
-        for dst in destinations:
-            dst_ip = dst.get('ip', '')
-            if dst_ip and dst_ip != 'N/A':
-                if is_private_ip(dst_ip):
-                    has_private_dst = True
-                else:
-                    has_public_dst = True
-
-        # Classify based on IP analysis
-        if has_public_dst or has_public_src:
-            # Any public IP involvement = internet traffic
-            if has_private_src or has_private_dst:
-                # Mix of public and private = mixed (less common)
-                return 'internet'  # Treat as internet since it touches public IPs
-            else:
-                return 'internet'
-        elif has_private_src and has_private_dst:
-            # All IPs are private = local traffic
-            return 'local'
-        elif has_private_src or has_private_dst:
-            # Only one side analyzed and it's private
-            return 'local'
+    # Any public IP involvement = internet traffic, so stop at the first one;
+    # otherwise any private IP (one side or both) = local traffic
+    has_private = False
+    for endpoints in (sources, destinations):
+        for endpoint in endpoints or ():
+            ip = endpoint.get('ip', '')
+            if ip and ip != 'N/A':
+                if not is_private_ip(ip):
+                    return 'internet'
+                has_private = True
+    if has_private:
+        return 'local'
 
     # Strategy 3: Use firewall category as fallback
     if category:
-        cat_lower = category.lower()
-        if 'private-ip' in cat_lower or 'internal' in cat_lower or 'local' in cat_lower:
-            return 'local'
-        elif 'internet' in cat_lower or 'cloud' in cat_lower or 'web' in cat_lower:
-            return 'internet'
+        category_direction = _classify_category(category)
+        if category_direction is not None:
+            return category_direction
 
     # Unable to determine
     return 'unknown'
 
 
+@lru_cache(maxsize=512)
+def _classify_zones(zones: frozenset) -> Optional[str]:
+    """
+    Traffic direction implied by a set of security zones alone (memoized).
+
+    Args:
+        zones: Zone names as seen in the logs (any case)
+
+    Returns:
+        str: "internet", "local" or "mixed", or None if the zones don't decide it
+    """
+    zone_set = set(z.lower() for z in zones if z)
+
+    # Check for typical zone patterns
+    if zone_set & _EXTERNAL_ZONES:
+        # Traffic involving untrust zone = internet traffic
+        return 'internet'
+    elif zone_set == {'trust'}:
+        # Traffic entirely within trust zone = local traffic
+        return 'local'
+    elif len(zone_set) > 1:
+        # Multiple zones (not just untrust) = mixed
+        return 'mixed'
+    return None
+
+
+@lru_cache(maxsize=512)
+def _classify_category(category: str) -> Optional[str]:
+    """
+    Traffic direction implied by a firewall application category (memoized).
+
+    Args:
+        category: Application category from firewall
+
+    Returns:
+        str: "local" or "internet", or None if the category doesn't decide it
+    """
+    cat_lower = category.lower()
+    if 'private-ip' in cat_lower or 'internal' in cat_lower or 'local' in cat_lower:
+        return 'local'
+    elif 'internet' in cat_lower or 'cloud' in cat_lower or 'web' in cat_lower:
+        return 'internet'
+    return None
+
+
+class _AppCountTarget:
+    """
+    XML parser target that counts <entry><app> names while the response is parsed.
+
+    No element tree is built: the parser streams start/data/end events here and
+    close() returns the Counter, the job <status> and the root element's status
+    attribute. Works with both lxml and xml.etree XMLParser.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.job_status = None  # text of the first <status>, if any
+        self.response_status = None  # <response status="..."> of the root element
+        self._depth = 0
+        self._status_depth = None  # depth of the <status> being read, if any
+        self._entry_depth = None  # depth of the <entry> currently open, if any
+        self._app_depth = None  # depth of the <app> currently open, if any
+        self._buf = []
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        if self._depth == 1:
+            self.response_status = attrib.get('status')
+        elif tag == 'entry' and self._entry_depth is None:
+            self._entry_depth = self._depth
+        elif tag == 'app' and self._entry_depth is not None and self._depth == self._entry_depth + 1:
+            self._app_depth = self._depth
+            self._buf.clear()
+        elif tag == 'status' and self.job_status is None and self._entry_depth is None:
+            self._status_depth = self._depth
+            self._buf.clear()
+
+    def data(self, data):
+        # Only the app/status element's own text, like findtext()
+        if self._depth == self._app_depth or self._depth == self._status_depth:
+            self._buf.append(data)
+
+    def end(self, tag):
+        if self._depth == self._status_depth:
+            self.job_status = ''.join(self._buf)
+            self._status_depth = None
+        elif self._depth == self._app_depth:
+            app_name = ''.join(self._buf)
+            if app_name:
+                self.counts[app_name] += 1
+            self._app_depth = None
+        elif self._depth == self._entry_depth:
+            self._entry_depth = None
+        self._depth -= 1
+
+    def close(self):
+        return self.counts, self.job_status, self.response_status
+
+
+def _count_log_apps(content: bytes) -> Tuple[Counter, Optional[str], Optional[str]]:
+    """
+    Count application names across the entries of a log query response.
+
+    Args:
+        content: Raw response bytes (response.content)
+
+    Returns:
+        tuple: (Counter of app name -> number of log entries, job status text or None,
+                response status attribute or None)
+    """
+    target = _AppCountTarget()
+    if lxml_etree is not None:
+        parser = lxml_etree.XMLParser(target=target, resolve_entities=False, no_network=True)
+    else:
+        parser = ET.XMLParser(target=target)
+    parser.feed(content)
+    return parser.close()
+
+
 def get_top_applications(
     firewall_config: Tuple[str, str, str],
     top_count: int = 5
@@ -182,15 +283,17 @@ def get_top_applications(
         response = api_request_get(base_url, params=params, verify=False, timeout=10)
         debug(f"Top apps traffic log query status: {response.status_code}")
 
-        app_counts = {}
+        app_counts = Counter()
 
         if response.status_code == 200:
-            root = ET.fromstring(response.text)
+            if lxml_etree is not None:
+                root = lxml_etree.fromstring(response.content, parser=_LXML_PARSER)
+            else:
+                root = ET.fromstring(response.content)
             job_id = root.find('.//job')
 
             if job_id is not None and job_id.text:
                 debug(f"Top apps job ID: {job_id.text}")
-                time.sleep(1)
 
                 result_params = {
                     'type': 'log',
@@ -199,22 +302,38 @@ def get_top_applications(
                     'key': api_key
                 }
 
-                result_response = api_request_get(base_url, params=result_params, verify=False, timeout=10)
-
-                if result_response.status_code == 200:
-                    result_root = ET.fromstring(result_response.text)
-
-                    # Count applications
-                    for entry in result_root.findall('.//entry'):
-                        app_elem = entry.find('.//app')
-                        if app_elem is not None and app_elem.text:
-                            app_name = app_elem.text
-                            if app_name not in app_counts:
-                                app_counts[app_name] = 0
-                            app_counts[app_name] += 1
-
-        # Sort by count and get top N
-        top_apps = sorted(app_counts.items(), key=lambda x: x[1], reverse=True)[:top_count]
+                # Poll with backoff until the job finishes, instead of a fixed 1s wait
+                delay = TOP_APPS_POLL_INITIAL_DELAY
+                started = time.monotonic()
+                poll_until = started + TOP_APPS_POLL_WINDOW
+                deadline = started + TOP_APPS_POLL_TIMEOUT
+                while True:
+                    time.sleep(delay)
+                    # Each request only gets the time left before the overall limit
+                    remaining = deadline - time.monotonic()
+                    result_response = api_request_get(base_url, params=result_params, verify=False, timeout=remaining)
+
+                    if result_response.status_code != 200:
+                        debug(f"Top apps job poll failed with status {result_response.status_code}")
+                        break
+
+                    # Count applications during parsing, without building a tree
+                    counts, job_status, response_status = _count_log_apps(result_response.content)
+                    if response_status == 'error':
+                        debug("Top apps job poll returned an error response")
+                        break
+                    app_counts = counts
+                    if job_status == 'FIN':
+                        break
+
+                    if time.monotonic() >= poll_until:
+                        # Keep whatever the last poll returned, as the fixed wait did
+                        debug(f"Top apps job not finished after {TOP_APPS_POLL_WINDOW}s, using partial results")
+                        break
+                    delay = min(delay * 2, TOP_APPS_POLL_MAX_DELAY)
+
+        # Top N by count (heap selection, no full sort)
+        top_apps = app_counts.most_common(top_count)
         debug(f"Top {top_count} applications: {top_apps}")
 
         # Calculate total unique applications
@@ -230,11 +349,13 @@ def get_top_applications(
         return {'apps': [], 'total_count': 0}
 
 
+@lru_cache(maxsize=4096)
 def extract_vlan_from_interface(interface_name: Optional[str]) -> Optional[str]:
     """
     Extract VLAN ID from interface name.
 
     Common formats: ethernet1/1.10, ae1.100, vlan.100, etc.
+    Memoized, since the same few interface names repeat across every log.
 
     Args:
         interface_name: Interface name string
@@ -245,19 +366,153 @@ def extract_vlan_from_interface(interface_name: Optional[str]) -> Optional[str]:
     if not interface_name:
         return None
 
-    # Check for sub-interface format (e.g., ethernet1/1.10, ae1.100)
-    if '.' in interface_name:
-        parts = interface_name.split('.')
-        if len(parts) >= 2 and parts[-1].isdigit():
-            return f"VLAN {parts[-1]}"
+    # Sub-interface (ethernet1/1.10, ae1.100) or vlan interface (vlan.100) suffix
+    match = _VLAN_SUFFIX_RE.search(interface_name)
+    return f"VLAN {match.group(1)}" if match else None
 
-    # Check for vlan interface format (e.g., vlan.100)
-    if interface_name.lower().startswith('vlan'):
-        parts = interface_name.split('.')
-        if len(parts) >= 2 and parts[-1].isdigit():
-            return f"VLAN {parts[-1]}"
 
-    return None
+# Traffic log fields used by get_application_statistics, in unpack order.
+# Traffic log dicts always carry every key, so one C-level itemgetter call
+# replaces a .get() per field.
+_LOG_FIELDS = ('app', 'category', 'src', 'dst', 'time', 'bytes_sent', 'bytes_received',
+               'proto', 'dport', 'from_zone', 'to_zone', 'inbound_if', 'outbound_if')
+_log_row = itemgetter(*_LOG_FIELDS)
+
+# Sort key for source/destination detail entries
+_by_bytes = itemgetter('bytes')
+
+# (DHCP hostname, custom_name, original_hostname) for IPs with no lease or device entry
+_NO_HOST_INFO = ('', None, None)
+
+
+class _DestDetails(dict):
+    """(dst, dport) -> destination totals; like defaultdict, but the new entry is built from its key."""
+
+    def __missing__(self, key):
+        dst, dport = key
+        entry = self[key] = {'ip': dst, 'port': dport, 'bytes': 0, 'sessions': 0}
+        return entry
+
+
+class _SourceDetails(dict):
+    """Source IP -> source totals with nested per-destination totals, created on first use."""
+
+    def __missing__(self, src):
+        entry = self[src] = {'ip': src, 'bytes': 0, 'destinations': _DestDetails()}
+        return entry
+
+
+@dataclass(slots=True)
+class _AppStat:
+    """Per-application accumulator for get_application_statistics (category is set from the first log)."""
+    category: str = 'unknown'
+    sessions: int = 0
+    bytes: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    source_details: dict = field(default_factory=_SourceDetails)  # Track bytes per source IP
+    dest_details: dict = field(default_factory=_DestDetails)  # Track bytes per destination
+    protocols: set = field(default_factory=set)
+    ports: set = field(default_factory=set)
+    vlans: set = field(default_factory=set)
+    zones: set = field(default_factory=set)
+
+
+def _new_category_stat() -> Dict[str, int]:
+    """
+    Empty per-category byte/session totals for get_application_statistics.
+
+    Returns:
+        dict: Zeroed bytes, sessions, bytes_sent and bytes_received
+    """
+    return {
+        'bytes': 0,
+        'sessions': 0,
+        'bytes_sent': 0,
+        'bytes_received': 0
+    }
+
+
+def _finalize_app(app_name: str, stats: _AppStat, host_info: Dict[str, Tuple]) -> Dict[str, Any]:
+    """
+    Build the result entry for one application from its accumulated stats.
+
+    Args:
+        app_name: Application name
+        stats: Accumulated stats for the application
+        host_info: IP -> (DHCP hostname, custom_name, original_hostname)
+
+    Returns:
+        dict: Application entry with top sources/destinations and traffic direction
+    """
+    # Top 50 sources by bytes (heap selection), enriched with hostnames
+    source_list = []
+    for src_info in heapq.nlargest(50, stats.source_details.values(), key=_by_bytes):
+        src_ip = src_info['ip']
+        # Display name priority: custom_name -> original_hostname -> DHCP hostname -> IP
+        hostname, custom_name, original_hostname = host_info.get(src_ip, _NO_HOST_INFO)
+
+        # Phase 2: Top 50 destinations per source, by bytes descending
+        dest_list_for_source = [
+            {
+                'ip': dest_info['ip'],
+                'port': dest_info['port'],
+                'bytes': dest_info['bytes'],
+                'sessions': dest_info.get('sessions', 1)
+            }
+            for dest_info in heapq.nlargest(50, src_info.get('destinations', {}).values(), key=_by_bytes)
+        ]
+
+        source_list.append({
+            'ip': src_ip,
+            'bytes': src_info['bytes'],
+            'hostname': hostname,  # DHCP hostname (fallback)
+            'custom_name': custom_name,  # Custom name from metadata (highest priority)
+            'original_hostname': original_hostname,  # Original hostname (fallback if no custom_name)
+            'destinations': dest_list_for_source
+        })
+
+    # Top 50 destinations by bytes descending
+    dest_list = [
+        {
+            'ip': dest_info['ip'],
+            'port': dest_info['port'],
+            'bytes': dest_info['bytes']
+        }
+        for dest_info in heapq.nlargest(50, stats.dest_details.values(), key=_by_bytes)
+    ]
+
+    # Classify traffic direction using multiple signals (all IPs, not just the top 50)
+    traffic_direction = classify_traffic_direction(
+        sources=stats.source_details.values(),
+        destinations=stats.dest_details.values(),
+        zones=list(stats.zones),
+        category=stats.category
+    )
+
+    # Unique IPs come from the detail dicts' keys/values rather than separate sets
+    source_ips = list(stats.source_details)
+    dest_ips = list({dest_info['ip'] for dest_info in stats.dest_details.values()})
+
+    return {
+        'name': app_name,
+        'category': stats.category,
+        'sessions': stats.sessions,
+        'bytes': stats.bytes,
+        'bytes_sent': stats.bytes_sent,
+        'bytes_received': stats.bytes_received,
+        'source_count': len(source_ips),
+        'dest_count': len(dest_ips),
+        'source_ips': source_ips[:50],  # Limit to 50 (legacy, for backward compatibility)
+        'sources': source_list,  # Top 50 sources with bytes
+        'dest_ips': dest_ips[:50],
+        'destinations': dest_list,  # Top 50 destinations with details
+        'protocols': list(stats.protocols),
+        'ports': list(stats.ports)[:20],  # Limit to 20
+        'vlans': list(stats.vlans),
+        'zones': list(stats.zones),
+        'traffic_direction': traffic_direction  # NEW: local, internet, mixed, or unknown
+    }
 
 
 def get_application_statistics(
@@ -289,231 +544,115 @@ def get_application_statistics(
         max_logs = APPLICATION_SETTINGS['max_logs_analytics']
     debug("=== get_application_statistics called ===")
     try:
-        traffic_logs_data = get_traffic_logs(firewall_config, max_logs)
-        traffic_logs = traffic_logs_data.get('logs', [])
-        debug(f"Retrieved {len(traffic_logs)} traffic logs for application analysis")
-
-        # Get DHCP leases for hostname resolution
-        dhcp_hostnames = get_dhcp_leases(firewall_config)
+        # The three firewall queries are independent, so overlap their round-trips
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # Streamed: logs are converted and aggregated one at a time, never held as a list
+            traffic_logs_future = executor.submit(iter_traffic_logs, firewall_config, max_logs)
+            # DHCP leases for hostname resolution
+            dhcp_future = executor.submit(get_dhcp_leases, firewall_config)
+            # Connected devices for custom name enrichment
+            # This gives us IP -> {custom_name, original_hostname} mapping
+            debug("Fetching connected devices for custom name enrichment")
+            devices_future = executor.submit(get_connected_devices, firewall_config)
+
+            traffic_logs = traffic_logs_future.result()
+            dhcp_hostnames = dhcp_future.result()
+            connected_devices = devices_future.result()
         debug(f"Retrieved {len(dhcp_hostnames)} DHCP hostname mappings for source IP enrichment")
 
-        # Get connected devices for custom name enrichment
-        # This gives us IP -> {custom_name, original_hostname} mapping
-        debug("Fetching connected devices for custom name enrichment")
-        connected_devices = get_connected_devices(firewall_config)
-        # Create IP-to-device mapping for quick lookups
-        ip_to_device = {}
+        # Resolve each known IP once to (DHCP hostname, custom_name, original_hostname),
+        # so enrichment below is a single lookup per source IP
+        host_info = {ip: (hostname, None, None) for ip, hostname in dhcp_hostnames.items()}
+        device_count = 0
         if isinstance(connected_devices, list):
             for device in connected_devices:
-                if device.get('ip') and device['ip'] != '-':
-                    ip_to_device[device['ip']] = {
-                        'custom_name': device.get('custom_name'),
-                        'original_hostname': device.get('original_hostname', device.get('hostname', '-'))
-                    }
-        debug(f"Created IP-to-device mapping for {len(ip_to_device)} devices")
+                ip = device.get('ip')
+                if ip and ip != '-':
+                    host_info[ip] = (
+                        dhcp_hostnames.get(ip, ''),
+                        device.get('custom_name'),
+                        device.get('original_hostname', device.get('hostname', '-'))
+                    )
+                    device_count += 1
+        debug(f"Created IP-to-device mapping for {device_count} devices")
 
         # Aggregate by application
-        app_stats = {}
+        app_stats = defaultdict(_AppStat)
         total_sessions = 0
         total_bytes = 0
-        vlans = set()
-        zones = set()
-        earliest_time = None
-        latest_time = None
-
-        for log in traffic_logs:
-            app = log.get('app', 'unknown')
-            category = log.get('category', 'unknown')
-            src = log.get('src', '')
-            dst = log.get('dst', '')
-            log_time = log.get('time', '')
-
-            # Track earliest and latest timestamps
+        log_times = []
+
+        # Hot-loop names bound locally (LOAD_FAST instead of global/attribute lookups)
+        _int = int
+        extract_vlan = extract_vlan_from_interface
+        add_log_time = log_times.append
+
+        for (app, category, src, dst, log_time, bytes_sent, bytes_received,
+             proto, dport, from_zone, to_zone, inbound_if, outbound_if) in map(_log_row, traffic_logs):
+            # Collect timestamps; earliest/latest are taken once after the loop
             if log_time:
-                if earliest_time is None or log_time < earliest_time:
-                    earliest_time = log_time
-                if latest_time is None or log_time > latest_time:
-                    latest_time = log_time
+                add_log_time(log_time)
 
             # Calculate total bytes (sent + received)
-            bytes_sent = int(log.get('bytes_sent', 0))
-            bytes_received = int(log.get('bytes_received', 0))
+            bytes_sent = _int(bytes_sent or 0)
+            bytes_received = _int(bytes_received or 0)
             bytes_val = bytes_sent + bytes_received
-            proto = log.get('proto', '')
-            dport = log.get('dport', '')
-            from_zone = log.get('from_zone', '')
-            to_zone = log.get('to_zone', '')
-            inbound_if = log.get('inbound_if', '')
-            outbound_if = log.get('outbound_if', '')
 
             # Extract VLANs from interface names (not zones)
-            inbound_vlan = extract_vlan_from_interface(inbound_if)
-            outbound_vlan = extract_vlan_from_interface(outbound_if)
-
-            if inbound_vlan:
-                vlans.add(inbound_vlan)
-            if outbound_vlan:
-                vlans.add(outbound_vlan)
-
-            # Track security zones
-            if from_zone:
-                zones.add(from_zone)
-            if to_zone:
-                zones.add(to_zone)
+            inbound_vlan = extract_vlan(inbound_if)
+            outbound_vlan = extract_vlan(outbound_if)
 
             # Update summary totals
             total_sessions += 1
             total_bytes += bytes_val
 
-            if app not in app_stats:
-                app_stats[app] = {
-                    'name': app,
-                    'category': category,
-                    'sessions': 0,
-                    'bytes': 0,
-                    'bytes_sent': 0,
-                    'bytes_received': 0,
-                    'source_ips': set(),
-                    'dest_ips': set(),
-                    'source_details': {},  # Track bytes per source IP
-                    'dest_details': {},  # Track bytes per destination
-                    'protocols': set(),
-                    'ports': set(),
-                    'vlans': set(),
-                    'zones': set()
-                }
+            stats = app_stats[app]
+            if not stats.sessions:
+                # First log for this app decides its category
+                stats.category = category
 
-            app_stats[app]['sessions'] += 1
-            app_stats[app]['bytes'] += bytes_val
-            app_stats[app]['bytes_sent'] += bytes_sent
-            app_stats[app]['bytes_received'] += bytes_received
+            stats.sessions += 1
+            stats.bytes += bytes_val
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
             if src:
-                app_stats[app]['source_ips'].add(src)
-                # Track bytes per source IP with nested destinations
-                if src not in app_stats[app]['source_details']:
-                    app_stats[app]['source_details'][src] = {
-                        'ip': src,
-                        'bytes': 0,
-                        'destinations': {}  # Track destinations per source
-                    }
-                app_stats[app]['source_details'][src]['bytes'] += bytes_val
+                # Track bytes per source IP with nested destinations (entries created on first use)
+                source_entry = stats.source_details[src]
+                source_entry['bytes'] += bytes_val
 
                 # Track destination INSIDE this source (preserves source→dest relationship)
                 if dst:
-                    dest_key = f"{dst}:{dport}" if dport else dst
-                    if dest_key not in app_stats[app]['source_details'][src]['destinations']:
-                        app_stats[app]['source_details'][src]['destinations'][dest_key] = {
-                            'ip': dst,
-                            'port': dport,
-                            'bytes': 0,
-                            'sessions': 0
-                        }
-                    app_stats[app]['source_details'][src]['destinations'][dest_key]['bytes'] += bytes_val
-                    app_stats[app]['source_details'][src]['destinations'][dest_key]['sessions'] += 1
+                    dest_entry = source_entry['destinations'][(dst, dport)]
+                    dest_entry['bytes'] += bytes_val
+                    dest_entry['sessions'] += 1
 
             if dst:
-                app_stats[app]['dest_ips'].add(dst)
                 # Keep app-level dest_details for backward compatibility (Applications page)
-                dest_key = f"{dst}:{dport}" if dport else dst
-                if dest_key not in app_stats[app]['dest_details']:
-                    app_stats[app]['dest_details'][dest_key] = {
-                        'ip': dst,
-                        'port': dport,
-                        'bytes': 0
-                    }
-                app_stats[app]['dest_details'][dest_key]['bytes'] += bytes_val
-            if proto: app_stats[app]['protocols'].add(proto)
-            if dport: app_stats[app]['ports'].add(dport)
+                stats.dest_details[(dst, dport)]['bytes'] += bytes_val
+            if proto: stats.protocols.add(proto)
+            if dport: stats.ports.add(dport)
             # Track VLANs from interfaces (not zones)
-            if inbound_vlan: app_stats[app]['vlans'].add(inbound_vlan)
-            if outbound_vlan: app_stats[app]['vlans'].add(outbound_vlan)
+            if inbound_vlan: stats.vlans.add(inbound_vlan)
+            if outbound_vlan: stats.vlans.add(outbound_vlan)
             # Track security zones
-            if from_zone: app_stats[app]['zones'].add(from_zone)
-            if to_zone: app_stats[app]['zones'].add(to_zone)
+            if from_zone: stats.zones.add(from_zone)
+            if to_zone: stats.zones.add(to_zone)
+
+        debug(f"Aggregated {total_sessions} traffic logs for application analysis")
+
+        earliest_time = min(log_times) if log_times else None
+        latest_time = max(log_times) if log_times else None
+
+        # Overall VLANs/zones are the union of the per-app sets (each log is added once, per app)
+        vlans = set().union(*(stats.vlans for stats in app_stats.values()))
+        zones = set().union(*(stats.zones for stats in app_stats.values()))
 
         # Log VLAN and zone detection summary
         debug(f"Detected {len(vlans)} unique VLANs from interface data: {sorted(vlans)}")
         debug(f"Detected {len(zones)} unique security zones: {sorted(zones)}")
 
         # Convert sets to lists and format result
-        result = []
-        for app_name, stats in app_stats.items():
-            # Convert source_details dict to sorted list with hostname enrichment
-            source_list = []
-            for src_ip, src_info in stats['source_details'].items():
-                # Look up device info from connected devices (includes custom_name and original_hostname)
-                device_info = ip_to_device.get(src_ip)
-
-                # Determine display name: custom_name -> original_hostname -> DHCP hostname -> IP
-                custom_name = None
-                original_hostname = None
-                hostname = dhcp_hostnames.get(src_ip, '')
-
-                if device_info:
-                    custom_name = device_info.get('custom_name')
-                    original_hostname = device_info.get('original_hostname', hostname)
-
-                # Phase 2: Convert nested destinations dict to sorted list
-                dest_list_for_source = []
-                for dest_key, dest_info in src_info.get('destinations', {}).items():
-                    dest_list_for_source.append({
-                        'ip': dest_info['ip'],
-                        'port': dest_info['port'],
-                        'bytes': dest_info['bytes'],
-                        'sessions': dest_info.get('sessions', 1)
-                    })
-                # Sort destinations by bytes descending
-                dest_list_for_source.sort(key=lambda x: x['bytes'], reverse=True)
-
-                source_list.append({
-                    'ip': src_info['ip'],
-                    'bytes': src_info['bytes'],
-                    'hostname': hostname,  # DHCP hostname (fallback)
-                    'custom_name': custom_name,  # Custom name from metadata (highest priority)
-                    'original_hostname': original_hostname,  # Original hostname (fallback if no custom_name)
-                    'destinations': dest_list_for_source[:50]  # Phase 2: Top 50 destinations per source
-                })
-            # Sort sources by bytes descending
-            source_list.sort(key=lambda x: x['bytes'], reverse=True)
-
-            # Convert dest_details dict to sorted list
-            dest_list = []
-            for dest_key, dest_info in stats['dest_details'].items():
-                dest_list.append({
-                    'ip': dest_info['ip'],
-                    'port': dest_info['port'],
-                    'bytes': dest_info['bytes']
-                })
-            # Sort destinations by bytes descending
-            dest_list.sort(key=lambda x: x['bytes'], reverse=True)
-
-            # Classify traffic direction using multiple signals
-            traffic_direction = classify_traffic_direction(
-                sources=source_list,
-                destinations=dest_list,
-                zones=list(stats['zones']),
-                category=stats['category']
-            )
-
-            result.append({
-                'name': app_name,
-                'category': stats['category'],
-                'sessions': stats['sessions'],
-                'bytes': stats['bytes'],
-                'bytes_sent': stats['bytes_sent'],
-                'bytes_received': stats['bytes_received'],
-                'source_count': len(stats['source_ips']),
-                'dest_count': len(stats['dest_ips']),
-                'source_ips': list(stats['source_ips'])[:50],  # Limit to 50 (legacy, for backward compatibility)
-                'sources': source_list[:50],  # Top 50 sources with bytes
-                'dest_ips': list(stats['dest_ips'])[:50],
-                'destinations': dest_list[:50],  # Top 50 destinations with details
-                'protocols': list(stats['protocols']),
-                'ports': list(stats['ports'])[:20],  # Limit to 20
-                'vlans': list(stats['vlans']),
-                'zones': list(stats['zones']),
-                'traffic_direction': traffic_direction  # NEW: local, internet, mixed, or unknown
-            })
+        result = [_finalize_app(app_name, stats, host_info) for app_name, stats in app_stats.items()]
 
         # Sort by bytes (volume) descending by default
         result.sort(key=lambda x: x['bytes'], reverse=True)
@@ -521,61 +660,32 @@ def get_application_statistics(
         debug(f"Aggregated {len(result)} unique applications")
 
         # Aggregate bytes by category for alerting
-        category_stats = {}
-        category_stats_lan = {}  # Local LAN only
-        category_stats_internet = {}  # Internet only
+        category_stats = defaultdict(_new_category_stat)
+        category_stats_lan = defaultdict(_new_category_stat)  # Local LAN only
+        category_stats_internet = defaultdict(_new_category_stat)  # Internet only
+        by_direction = {'local': category_stats_lan, 'internet': category_stats_internet}
 
         for app in result:
-            category = app.get('category', 'unknown')
-            traffic_dir = app.get('traffic_direction', 'unknown')
-
-            # Overall category stats (for backward compatibility)
-            if category not in category_stats:
-                category_stats[category] = {
-                    'bytes': 0,
-                    'sessions': 0,
-                    'bytes_sent': 0,
-                    'bytes_received': 0
-                }
-            category_stats[category]['bytes'] += app['bytes']
-            category_stats[category]['sessions'] += app['sessions']
-            category_stats[category]['bytes_sent'] += app['bytes_sent']
-            category_stats[category]['bytes_received'] += app['bytes_received']
-
-            # Split by traffic direction
-            if traffic_dir == 'local':
-                if category not in category_stats_lan:
-                    category_stats_lan[category] = {
-                        'bytes': 0,
-                        'sessions': 0,
-                        'bytes_sent': 0,
-                        'bytes_received': 0
-                    }
-                category_stats_lan[category]['bytes'] += app['bytes']
-                category_stats_lan[category]['sessions'] += app['sessions']
-                category_stats_lan[category]['bytes_sent'] += app['bytes_sent']
-                category_stats_lan[category]['bytes_received'] += app['bytes_received']
-            elif traffic_dir == 'internet':
-                if category not in category_stats_internet:
-                    category_stats_internet[category] = {
-                        'bytes': 0,
-                        'sessions': 0,
-                        'bytes_sent': 0,
-                        'bytes_received': 0
-                    }
-                category_stats_internet[category]['bytes'] += app['bytes']
-                category_stats_internet[category]['sessions'] += app['sessions']
-                category_stats_internet[category]['bytes_sent'] += app['bytes_sent']
-                category_stats_internet[category]['bytes_received'] += app['bytes_received']
+            category = app['category']
+            # Overall category stats (for backward compatibility), plus the split by traffic direction
+            direction_stats = by_direction.get(app['traffic_direction'])
+            for target in (category_stats, direction_stats):
+                if target is None:
+                    continue
+                totals = target[category]
+                totals['bytes'] += app['bytes']
+                totals['sessions'] += app['sessions']
+                totals['bytes_sent'] += app['bytes_sent']
+                totals['bytes_received'] += app['bytes_received']
 
         debug(f"Aggregated {len(category_stats)} unique categories (overall), {len(category_stats_lan)} LAN, {len(category_stats_internet)} Internet")
 
         # Return both applications list, category stats, and summary statistics
         return {
             'applications': result,
-            'categories': category_stats,
-            'categories_lan': category_stats_lan,
-            'categories_internet': category_stats_internet,
+            'categories': dict(category_stats),
+            'categories_lan': dict(category_stats_lan),
+            'categories_internet': dict(category_stats_internet),
             'summary': {
                 'total_applications': len(result),
                 'total_sessions': total_sessions,
@@ -11,6 +11,7 @@ Separate module per .clinerules file size guidelines
 """
 
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from logger import debug, error, exception, warning
 from utils import api_request_post
 
@@ -304,6 +305,30 @@ def install_content_update(firewall_ip, api_key, content_type='content', version
         return {'status': 'error', 'content_type': content_type, 'name': type_name, 'message': str(e)}
 
 
+def _check_content_type_safe(firewall_ip, api_key, content_type):
+    """
+    Run check_content_updates for one type, turning an exception into an error result.
+
+    Args:
+        firewall_ip: Firewall IP address
+        api_key: API key for authentication
+        content_type: Content type key
+
+    Returns:
+        tuple: (result dict, exception message or None)
+    """
+    try:
+        return check_content_updates(firewall_ip, api_key, content_type), None
+    except Exception as e:
+        exception(f"Error checking {content_type}: {e}")
+        return {
+            'status': 'error',
+            'content_type': content_type,
+            'name': CONTENT_TYPES[content_type]['name'],
+            'message': str(e)
+        }, str(e)
+
+
 def check_all_content_updates(firewall_ip, api_key):
     """
     Check for updates for all supported content types
@@ -326,26 +351,25 @@ def check_all_content_updates(firewall_ip, api_key):
     errors = []
     updates_available = 0
 
-    for content_type in CONTENT_TYPES.keys():
-        try:
-            result = check_content_updates(firewall_ip, api_key, content_type)
+    # The per-type checks are independent firewall round-trips, so run them concurrently;
+    # map() keeps results in CONTENT_TYPES order
+    content_types = list(CONTENT_TYPES)
+    with ThreadPoolExecutor(max_workers=len(content_types)) as executor:
+        outcomes = executor.map(
+            lambda content_type: _check_content_type_safe(firewall_ip, api_key, content_type),
+            content_types
+        )
+
+        for content_type, (result, check_error) in zip(content_types, outcomes):
             results.append(result)
 
-            if result.get('status') == 'success' and result.get('needs_update'):
+            if check_error is not None:
+                errors.append(f"{content_type}: {check_error}")
+            elif result.get('status') == 'success' and result.get('needs_update'):
                 updates_available += 1
             elif result.get('status') == 'error':
                 errors.append(f"{content_type}: {result.get('message', 'Unknown error')}")
 
-        except Exception as e:
-            exception(f"Error checking {content_type}: {e}")
-            errors.append(f"{content_type}: {str(e)}")
-            results.append({
-                'status': 'error',
-                'content_type': content_type,
-                'name': CONTENT_TYPES[content_type]['name'],
-                'message': str(e)
-            })
-
     # Determine overall status
     if len(errors) == len(CONTENT_TYPES):
         status = 'error'
@@ -5,10 +5,84 @@ Handles system logs, threat logs, and traffic logs
 import xml.etree.ElementTree as ET
 import time
 import sys
+from io import BytesIO
 from utils import api_request_get
 from logger import debug, info, warning, error, exception
 from firewall_api_devices import get_dhcp_leases, get_connected_devices
 
+# Optional: faster C-level XML parsing for large traffic log responses (falls back to xml.etree)
+# Parser is hardened the same way as defusedxml: no entity expansion, no network access
+try:
+    from lxml import etree as lxml_etree
+    _LXML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+except ImportError:
+    lxml_etree = None
+
+
+def _parse_log_response(content):
+    """
+    Parse a log API response body, with lxml when available.
+
+    Args:
+        content: Raw response bytes (response.content)
+
+    Returns:
+        Element: Root element (lxml or xml.etree; find/iterfind/get/clear behave the same)
+    """
+    if lxml_etree is not None:
+        return lxml_etree.fromstring(content, parser=_LXML_PARSER)
+    return ET.fromstring(content)
+
+
+def _iterparse_tag(content, tag):
+    """
+    Stream the elements named tag out of a response body, each fully parsed.
+
+    Args:
+        content: Raw response bytes (response.content)
+        tag: Element name to yield
+
+    Yields:
+        Element: Each matching element once its end tag is parsed
+    """
+    if lxml_etree is not None:
+        for _, elem in lxml_etree.iterparse(BytesIO(content), events=('end',), tag=tag,
+                                            resolve_entities=False, no_network=True):
+            yield elem
+    else:
+        for _, elem in ET.iterparse(BytesIO(content), events=('end',)):
+            if elem.tag == tag:
+                yield elem
+
+
+def _release(elem):
+    """
+    Free a streamed element and, with lxml, the already-processed siblings before it.
+
+    Args:
+        elem: Element yielded by _iterparse_tag
+    """
+    elem.clear()
+    if lxml_etree is not None:
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def _find_first_text(content, tag):
+    """
+    Text of the first element named tag, parsing only as far as that element.
+
+    Args:
+        content: Raw response bytes (response.content)
+        tag: Element name to look for
+
+    Returns:
+        str: Element text, or None if there is no such element
+    """
+    for elem in _iterparse_tag(content, tag):
+        return elem.text
+    return None
+
 
 def get_system_logs(firewall_config, max_logs=50):
     """Fetch system logs from Palo Alto firewall"""
@@ -421,101 +495,160 @@ def get_threat_stats(firewall_config, max_logs=5):
         }
 
 
-def get_traffic_logs(firewall_config, max_logs=50):
-    """Fetch traffic logs from Palo Alto firewall"""
-    try:
-        firewall_ip, api_key, base_url = firewall_config
+def _query_traffic_logs(firewall_config, max_logs):
+    """
+    Run a traffic log query and wait for the job to finish.
+
+    Args:
+        firewall_config: Tuple of (firewall_ip, api_key, base_url)
+        max_logs: Number of logs to request
+
+    Returns:
+        bytes: Body of the response holding the log entries, or None if the
+               query failed or the job did not complete in time
+    """
+    firewall_ip, api_key, base_url = firewall_config
+
+    # Query traffic logs
+    log_query = "(subtype eq end)"
+    params = {
+        'type': 'log',
+        'log-type': 'traffic',
+        'query': log_query,
+        'nlogs': str(max_logs),
+        'key': api_key
+    }
+
+    response = api_request_get(base_url, params=params, verify=False, timeout=10)
+    debug(f"Traffic logs query status: {response.status_code}")
+
+    if response.status_code != 200:
+        return None
+
+    content = response.content
+    root = _parse_log_response(content)
+
+    # Check if this is a job response (async log query)
+    job_id = root.find('.//job')
+    if job_id is not None and job_id.text:
+        debug(f"Job ID received: {job_id.text}, fetching traffic log results...")
+
+        # Poll job status until complete (max 5 seconds)
+        for attempt in range(10):
+            time.sleep(0.5)
+            status_params = {
+                'type': 'log',
+                'action': 'get',
+                'job-id': job_id.text,
+                'key': api_key
+            }
 
-        # Query traffic logs
-        log_query = "(subtype eq end)"
-        params = {
-            'type': 'log',
-            'log-type': 'traffic',
-            'query': log_query,
-            'nlogs': str(max_logs),
-            'key': api_key
+            status_response = api_request_get(base_url, params=status_params, verify=False, timeout=10)
+            if status_response.status_code == 200:
+                # Only parse up to <status>; the entries are streamed later
+                job_status = _find_first_text(status_response.content, 'status')
+
+                if job_status == 'FIN':
+                    debug(f"Traffic log job completed after {(attempt + 1) * 0.5}s")
+                    content = status_response.content
+                    break
+                else:
+                    debug(f"Traffic log job status: {job_status if job_status is not None else 'unknown'} (attempt {attempt + 1})")
+        else:
+            debug("Traffic log job did not complete in 5 seconds")
+            return None
+
+    return content
+
+
+def _iter_traffic_log_entries(content):
+    """
+    Yield one traffic log dict per <entry>, streaming the response body.
+
+    Entries are parsed incrementally and freed once read, so memory stays flat
+    regardless of how many logs the response holds.
+
+    Args:
+        content: Response body returned by _query_traffic_logs
+
+    Yields:
+        dict: Traffic log fields (time, src, dst, app, bytes, zones, interfaces, ...)
+    """
+    for entry in _iterparse_tag(content, 'entry'):
+        time_generated = entry.get('time_generated', '')
+        src = entry.find('src')
+        dst = entry.find('dst')
+        sport = entry.find('sport')
+        dport = entry.find('dport')
+        app = entry.find('app')
+        category = entry.find('category')
+        proto = entry.find('proto')
+        action = entry.find('action')
+        bytes_sent = entry.find('bytes_sent')
+        bytes_received = entry.find('bytes')
+        packets = entry.find('packets')
+        session_end_reason = entry.find('session_end_reason')
+        from_zone = entry.find('from')
+        to_zone = entry.find('to')
+        # Extract VLAN interface information
+        inbound_if = entry.find('inbound_if')
+        outbound_if = entry.find('outbound_if')
+
+        log = {
+            'time': time_generated,
+            'src': src.text if src is not None else '',
+            'dst': dst.text if dst is not None else '',
+            'sport': sport.text if sport is not None else '',
+            'dport': dport.text if dport is not None else '',
+            'app': app.text if app is not None else '',
+            'category': category.text if category is not None else 'unknown',
+            'proto': proto.text if proto is not None else '',
+            'action': action.text if action is not None else '',
+            'bytes_sent': bytes_sent.text if bytes_sent is not None else '0',
+            'bytes_received': bytes_received.text if bytes_received is not None else '0',
+            'packets': packets.text if packets is not None else '0',
+            'session_end_reason': session_end_reason.text if session_end_reason is not None else '',
+            # Zone names repeat on every log: intern so they share one string object
+            'from_zone': sys.intern(from_zone.text) if from_zone is not None and from_zone.text else '',
+            'to_zone': sys.intern(to_zone.text) if to_zone is not None and to_zone.text else '',
+            'inbound_if': inbound_if.text if inbound_if is not None else '',
+            'outbound_if': outbound_if.text if outbound_if is not None else ''
         }
+        _release(entry)
+        yield log
 
-        response = api_request_get(base_url, params=params, verify=False, timeout=10)
-        debug(f"Traffic logs query status: {response.status_code}")
 
-        traffic_logs = []
+def iter_traffic_logs(firewall_config, max_logs=50):
+    """
+    Fetch traffic logs from Palo Alto firewall as a stream of log dicts.
 
-        if response.status_code == 200:
-            root = ET.fromstring(response.text)
+    The query runs (and its job is awaited) when this is called; the entries are
+    converted one at a time as the caller iterates, so no list of every log is
+    held. For single-pass consumers such as get_application_statistics.
 
-            # Check if this is a job response (async log query)
-            job_id = root.find('.//job')
-            if job_id is not None and job_id.text:
-                debug(f"Job ID received: {job_id.text}, fetching traffic log results...")
+    Args:
+        firewall_config: Tuple of (firewall_ip, api_key, base_url)
+        max_logs: Number of logs to request
 
-                # Poll job status until complete (max 5 seconds)
-                for attempt in range(10):
-                    time.sleep(0.5)
-                    status_params = {
-                        'type': 'log',
-                        'action': 'get',
-                        'job-id': job_id.text,
-                        'key': api_key
-                    }
-
-                    status_response = api_request_get(base_url, params=status_params, verify=False, timeout=10)
-                    if status_response.status_code == 200:
-                        status_root = ET.fromstring(status_response.text)
-                        job_status = status_root.find('.//status')
+    Returns:
+        iterator: Traffic log dicts, same fields as get_traffic_logs (empty on error)
+    """
+    try:
+        content = _query_traffic_logs(firewall_config, max_logs)
+    except Exception as e:
+        debug(f"Error fetching traffic logs: {e}")
+        return iter(())
+    if content is None:
+        return iter(())
+    return _iter_traffic_log_entries(content)
 
-                        if job_status is not None and job_status.text == 'FIN':
-                            debug(f"Traffic log job completed after {(attempt + 1) * 0.5}s")
-                            root = status_root
-                            break
-                        else:
-                            debug(f"Traffic log job status: {job_status.text if job_status is not None else 'unknown'} (attempt {attempt + 1})")
-                else:
-                    debug("Traffic log job did not complete in 5 seconds")
-                    return traffic_logs
 
-            # Find all log entries
-            for entry in root.findall('.//entry'):
-                time_generated = entry.get('time_generated', '')
-                src = entry.find('src')
-                dst = entry.find('dst')
-                sport = entry.find('sport')
-                dport = entry.find('dport')
-                app = entry.find('app')
-                category = entry.find('category')
-                proto = entry.find('proto')
-                action = entry.find('action')
-                bytes_sent = entry.find('bytes_sent')
-                bytes_received = entry.find('bytes')
-                packets = entry.find('packets')
-                session_end_reason = entry.find('session_end_reason')
-                from_zone = entry.find('from')
-                to_zone = entry.find('to')
-                # Extract VLAN interface information
-                inbound_if = entry.find('inbound_if')
-                outbound_if = entry.find('outbound_if')
-
-                traffic_logs.append({
-                    'time': time_generated,
-                    'src': src.text if src is not None else '',
-                    'dst': dst.text if dst is not None else '',
-                    'sport': sport.text if sport is not None else '',
-                    'dport': dport.text if dport is not None else '',
-                    'app': app.text if app is not None else '',
-                    'category': category.text if category is not None else 'unknown',
-                    'proto': proto.text if proto is not None else '',
-                    'action': action.text if action is not None else '',
-                    'bytes_sent': bytes_sent.text if bytes_sent is not None else '0',
-                    'bytes_received': bytes_received.text if bytes_received is not None else '0',
-                    'packets': packets.text if packets is not None else '0',
-                    'session_end_reason': session_end_reason.text if session_end_reason is not None else '',
-                    'from_zone': from_zone.text if from_zone is not None else '',
-                    'to_zone': to_zone.text if to_zone is not None else '',
-                    'inbound_if': inbound_if.text if inbound_if is not None else '',
-                    'outbound_if': outbound_if.text if outbound_if is not None else ''
-                })
-
-            debug(f"Found {len(traffic_logs)} traffic log entries")
+def get_traffic_logs(firewall_config, max_logs=50):
+    """Fetch traffic logs from Palo Alto firewall"""
+    try:
+        content = _query_traffic_logs(firewall_config, max_logs)
+        traffic_logs = list(_iter_traffic_log_entries(content)) if content is not None else []
+        debug(f"Found {len(traffic_logs)} traffic log entries")
 
         return {
             'status': 'success',
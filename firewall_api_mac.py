@@ -102,26 +102,10 @@ def lookup_mac_vendor(mac_address):
         return None
 
     try:
-        from config import load_vendor_database
-        vendor_db = load_vendor_database()
+        from config import lookup_vendor_longest
 
-        if not vendor_db:
-            return None
-
-        # Normalize MAC address (remove colons/dashes, uppercase)
-        mac_clean = mac_address.upper().replace(':', '').replace('-', '')
-
-        # Try matching with progressively shorter prefixes
-        # MA-L: 6 chars (00:00:0C -> 00000C)
-        # MA-M: 7 chars
-        # MA-S: 9 chars
-        for prefix_len in [6, 7, 9]:
-            if len(mac_clean) >= prefix_len:
-                prefix = mac_clean[:prefix_len]
-                if prefix in vendor_db:
-                    return vendor_db[prefix]
-
-        return None
+        # Longest-prefix match across MA-S (9), MA-M (7) and MA-L (6) prefixes
+        return lookup_vendor_longest(mac_address)
 
     except Exception as e:
         debug(f"Error looking up MAC vendor: {str(e)}")
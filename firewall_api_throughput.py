@@ -9,7 +9,7 @@ from datetime import datetime
 from config import load_settings
 from utils import api_request_get, get_api_stats
 from logger import debug, exception
-from device_manager import device_manager
+from device_manager import get_device_manager
 from firewall_api_metrics import get_cpu_temperature
 
 # Store per-device statistics for rate calculation
@@ -250,7 +250,7 @@ def get_throughput_data(device_id=None):
         monitored_interface = 'ethernet1/12'  # default
         wan_interface = ''  # default
         if device_id:
-            device = device_manager.get_device(device_id)
+            device = get_device_manager().get_device(device_id)
             if device:
                 if device.get('monitored_interface'):
                     monitored_interface = device['monitored_interface']
@@ -326,8 +326,8 @@ def register_routes(app, limiter):
                 device_id = settings.get('selected_device_id', '')
 
                 if not device_id or device_id.strip() == '':
-                    from device_manager import device_manager
-                    devices = device_manager.load_devices()
+                    from device_manager import get_device_manager
+                    devices = get_device_manager().load_devices()
                     enabled_devices = [d for d in devices if d.get('enabled', True)]
                     if enabled_devices:
                         device_id = enabled_devices[0].get('id')
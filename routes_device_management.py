@@ -5,10 +5,9 @@ Handles device list, create, read, update, delete, and connection testing
 from flask import jsonify, request
 from auth import login_required
 from config import load_settings, save_settings, EDITION, MAX_DEVICES
-from device_manager import device_manager
-from firewall_api import get_device_system_info  # OPTIMIZED: Combined uptime+version
+from device_manager import get_device_manager
+from firewall_api import get_device_system_info_many  # OPTIMIZED: Combined uptime+version, concurrent
 from logger import debug, info, error, exception
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from time import time
 
 
@@ -23,23 +22,34 @@ def register_device_management_routes(app, csrf, limiter):
     _device_info_cache = {}
     CACHE_TTL = 30  # seconds
 
-    def get_device_info_cached(device_id):
-        """Get device system info with TTL-based caching"""
+    def get_device_info_cached(device_ids):
+        """Get system info for several devices with TTL-based caching
+
+        Cache misses are fetched together in one concurrent batch.
+
+        Returns:
+            dict: {device_id: {'uptime': ..., 'version': ...}}
+        """
         now = time()
-        cache_key = device_id
+        results = {}
+        misses = []
 
         # Check cache
-        if cache_key in _device_info_cache:
-            cached_data, cached_time = _device_info_cache[cache_key]
-            if now - cached_time < CACHE_TTL:
-                debug(f"Cache HIT for device {device_id} (age: {int(now - cached_time)}s)")
-                return cached_data
-
-        # Cache miss or expired - fetch from firewall
-        debug(f"Cache MISS for device {device_id} - fetching from firewall")
-        info = get_device_system_info(device_id)
-        _device_info_cache[cache_key] = (info, now)
-        return info
+        for device_id in device_ids:
+            cached = _device_info_cache.get(device_id)
+            if cached is not None and now - cached[1] < CACHE_TTL:
+                debug("Cache HIT for device %s (age: %ds)", device_id, int(now - cached[1]))
+                results[device_id] = cached[0]
+            else:
+                misses.append(device_id)
+
+        # Cache miss or expired - fetch from firewalls in parallel
+        if misses:
+            debug("Cache MISS for %d devices - fetching from firewalls", len(misses))
+            for device_id, info in get_device_system_info_many(misses).items():
+                _device_info_cache[device_id] = (info, now)
+                results[device_id] = info
+        return results
 
     # ============================================================================
     # Device Management API Endpoints
@@ -54,38 +64,25 @@ def register_device_management_routes(app, csrf, limiter):
             start_time = time()
 
             # Load devices with encrypted API keys for API response (security)
-            devices = device_manager.load_devices(decrypt_api_keys=False)
-            groups = device_manager.get_groups()
+            devices = get_device_manager().load_devices(decrypt_api_keys=False)
+            groups = get_device_manager().get_groups()
 
             # Identify enabled devices that need info fetching
             enabled_devices = [d for d in devices if d.get('enabled', True)]
             debug(f"Fetching info for {len(enabled_devices)} enabled devices")
 
-            # OPTIMIZATION: Fetch device info in parallel using ThreadPoolExecutor
+            # OPTIMIZATION: Fetch device info in parallel (max 5 concurrent per API limit)
             # This reduces load time from N×2s (sequential) to max(2s) (parallel)
-            def fetch_device_info(device):
-                """Fetch system info for a single device (runs in thread pool)"""
-                try:
-                    info = get_device_info_cached(device['id'])
-                    device['uptime'] = info['uptime'] if info['uptime'] else 'N/A'
-                    device['version'] = info['version'] if info['version'] else 'N/A'
-                except Exception as e:
-                    debug(f"Error fetching info for device {device['id']}: {str(e)}")
-                    device['uptime'] = 'N/A'
-                    device['version'] = 'N/A'
-                return device
-
-            # Use ThreadPoolExecutor for parallel execution (max 5 workers per API limit)
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                # Submit all enabled devices for processing
-                futures = {executor.submit(fetch_device_info, device): device for device in enabled_devices}
+            try:
+                device_infos = get_device_info_cached([device['id'] for device in enabled_devices])
+            except Exception as e:
+                debug("Error fetching device info: %s", str(e))
+                device_infos = {}
 
-                # Wait for all futures to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()  # Results are updated in-place on device dict
-                    except Exception as e:
-                        debug(f"Thread pool future failed: {str(e)}")
+            for device in enabled_devices:
+                info = device_infos.get(device['id']) or {}
+                device['uptime'] = info.get('uptime') or 'N/A'
+                device['version'] = info.get('version') or 'N/A'
 
             # Mark disabled devices
             for device in devices:
@@ -172,7 +169,7 @@ def register_device_management_routes(app, csrf, limiter):
                 }), 400
 
             # Get device count before adding
-            existing_devices = device_manager.load_devices(decrypt_api_keys=False)
+            existing_devices = get_device_manager().load_devices(decrypt_api_keys=False)
             was_first_device = len(existing_devices) == 0
             debug(f"Existing device count: {len(existing_devices)}, is_first_device: {was_first_device}")
 
@@ -189,7 +186,7 @@ def register_device_management_routes(app, csrf, limiter):
                     'message': f'Community Edition supports up to {MAX_DEVICES} devices. Upgrade to Enterprise Edition for unlimited devices.'
                 }), 403
 
-            new_device = device_manager.add_device(name, ip, api_key, group, description, wan_interface=wan_interface)
+            new_device = get_device_manager().add_device(name, ip, api_key, group, description, wan_interface=wan_interface)
             debug(f"Device added successfully: {new_device['name']} ({new_device['id']})")
 
             # Auto-select this device if it's the first device OR no device is currently selected
@@ -200,7 +197,7 @@ def register_device_management_routes(app, csrf, limiter):
             # Check if current selection is valid
             if current_selected:
                 # Verify the currently selected device still exists
-                selected_device_exists = device_manager.get_device(current_selected) is not None
+                selected_device_exists = get_device_manager().get_device(current_selected) is not None
                 debug(f"Current selected device {current_selected} exists: {selected_device_exists}")
                 if not selected_device_exists:
                     current_selected = ''
@@ -233,7 +230,7 @@ def register_device_management_routes(app, csrf, limiter):
         """Get a specific device with encrypted API key"""
         try:
             # Get all devices with encrypted keys, then find the specific one
-            devices = device_manager.load_devices(decrypt_api_keys=False)
+            devices = get_device_manager().load_devices(decrypt_api_keys=False)
             device = next((d for d in devices if d.get('id') == device_id), None)
             if device:
                 return jsonify({
@@ -264,7 +261,7 @@ def register_device_management_routes(app, csrf, limiter):
                 debug("API key is empty, removing from updates to preserve existing key")
                 del data['api_key']
 
-            updated_device = device_manager.update_device(device_id, data)
+            updated_device = get_device_manager().update_device(device_id, data)
             if updated_device:
                 return jsonify({
                     'status': 'success',
@@ -290,10 +287,10 @@ def register_device_management_routes(app, csrf, limiter):
         debug(f"Delete device request for device_id: {device_id}")
         try:
             # Get device info before deleting for logging
-            device_to_delete = device_manager.get_device(device_id)
+            device_to_delete = get_device_manager().get_device(device_id)
             device_name = device_to_delete.get('name', 'unknown') if device_to_delete else 'unknown'
 
-            success = device_manager.delete_device(device_id)
+            success = get_device_manager().delete_device(device_id)
             if success:
                 debug(f"Device {device_name} ({device_id}) deleted successfully")
 
@@ -304,7 +301,7 @@ def register_device_management_routes(app, csrf, limiter):
 
                 if was_selected:
                     # Get remaining devices (use load_devices, not decrypt for API responses)
-                    remaining_devices = device_manager.load_devices(decrypt_api_keys=False)
+                    remaining_devices = get_device_manager().load_devices(decrypt_api_keys=False)
                     debug(f"Remaining devices after deletion: {len(remaining_devices)}")
 
                     if remaining_devices:
@@ -345,14 +342,14 @@ def register_device_management_routes(app, csrf, limiter):
     def test_device_connection(device_id):
         """Test connection to a device"""
         try:
-            device = device_manager.get_device(device_id)
+            device = get_device_manager().get_device(device_id)
             if not device:
                 return jsonify({
                     'status': 'error',
                     'message': 'Device not found'
                 }), 404
 
-            result = device_manager.test_connection(device['ip'], device['api_key'])
+            result = get_device_manager().test_connection(device['ip'], device['api_key'])
             return jsonify({
                 'status': 'success' if result['success'] else 'error',
                 'message': result['message']
@@ -379,7 +376,7 @@ def register_device_management_routes(app, csrf, limiter):
                     'message': 'IP and API Key are required'
                 }), 400
 
-            result = device_manager.test_connection(ip, api_key)
+            result = get_device_manager().test_connection(ip, api_key)
             return jsonify({
                 'status': 'success' if result['success'] else 'error',
                 'message': result['message']
@@ -609,8 +609,8 @@ def register_operations_routes(app, csrf, limiter):
             storage_stats = collector_stats.get('storage', {})
 
             # Get all devices to count monitored devices
-            from device_manager import device_manager
-            devices = device_manager.load_devices()
+            from device_manager import get_device_manager
+            devices = get_device_manager().load_devices()
             enabled_devices = [d for d in devices if d.get('enabled', True)]
 
             # Build response
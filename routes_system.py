@@ -328,8 +328,8 @@ def register_system_routes(app, csrf, limiter):
                 # Get per-device statistics
                 device_counts = storage.get_device_sample_counts()
 
-                from device_manager import device_manager
-                devices = device_manager.load_devices()
+                from device_manager import get_device_manager
+                devices = get_device_manager().load_devices()
                 device_map = {d['id']: d['name'] for d in devices}
 
                 for device_id, sample_count in device_counts.items():
@@ -551,8 +551,8 @@ def register_system_routes(app, csrf, limiter):
 
             if device_id and device_id.strip():
                 # Per-device tag filter from device_metadata (device-level settings)
-                from device_metadata import load_metadata, save_metadata
-                all_metadata = load_metadata(use_cache=False)
+                from device_metadata import load_metadata
+                all_metadata = load_metadata()
 
                 # Device-level settings stored under "_device_settings" key within device
                 if device_id in all_metadata:
@@ -606,8 +606,8 @@ def register_system_routes(app, csrf, limiter):
 
             if device_id and device_id.strip():
                 # v1.0.7: Save per-device in device_metadata (device-level settings)
-                from device_metadata import load_metadata, save_metadata
-                all_metadata = load_metadata(use_cache=False)
+                from device_metadata import load_metadata_mutable, save_metadata
+                all_metadata = load_metadata_mutable()
 
                 # Ensure device exists in metadata
                 if device_id not in all_metadata:
@@ -869,12 +869,12 @@ def register_system_routes(app, csrf, limiter):
         try:
             from throughput_storage_timescale import TimescaleStorage
             from config import TIMESCALE_DSN
-            from device_manager import device_manager
+            from device_manager import get_device_manager
 
             storage = TimescaleStorage(TIMESCALE_DSN)
 
             # Get devices from device_manager
-            devices = device_manager.load_devices()
+            devices = get_device_manager().load_devices()
             device_map = {d['id']: d['name'] for d in devices}
 
             # Get tag counts per device from database
@@ -22,7 +22,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from logger import debug, info, warning, error, exception
 from scan_storage import ScanStorage
-from device_manager import device_manager
+from device_manager import get_device_manager
 from device_metadata import load_metadata
 from firewall_api import get_firewall_config
 from firewall_api_devices import get_connected_devices
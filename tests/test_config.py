@@ -0,0 +1,87 @@
+"""
+Tests for the MAC vendor database and its SQLite index.
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+class VendorIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+        self.vendor_file = os.path.join(self.tmpdir, 'mac_vendor_db.json')
+        self.index_file = os.path.join(self.tmpdir, 'mac_vendor_db.sqlite')
+
+        for patcher in (mock.patch.object(config, 'VENDOR_DB_FILE', self.vendor_file),
+                        mock.patch.object(config, 'VENDOR_DB_CACHE_FILE', self.vendor_file + '.cache'),
+                        mock.patch.object(config, 'VENDOR_DB_INDEX_FILE', self.index_file),
+                        mock.patch.object(config, 'SETTINGS_FILE', os.path.join(self.tmpdir, 'settings.json'))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self._reset()
+        self.addCleanup(self._reset)
+
+    @staticmethod
+    def _reset():
+        if config._vendor_index_conn is not None:
+            config._vendor_index_conn.close()
+        config._vendor_index_conn = None
+        config._vendor_index_mtime = None
+        config._vendor_db_cache = None
+        config._vendor_db_loaded = False
+
+    def _write_vendors(self, vendor_name, mtime_ns):
+        with open(self.vendor_file, 'w') as f:
+            json.dump([{'macPrefix': '00:00:0C', 'vendorName': vendor_name}], f)
+        os.utime(self.vendor_file, ns=(mtime_ns, mtime_ns))
+
+    def test_lookup_uses_index_without_loading_dict(self):
+        self._write_vendors('Cisco', 1_000_000_000)
+        config.load_vendor_database()
+        self._reset()
+
+        self.assertEqual(config.lookup_vendor('00000C'), 'Cisco')
+        self.assertFalse(config._vendor_db_loaded)
+
+    def test_index_older_than_json_is_rebuilt(self):
+        self._write_vendors('Old Vendor', 1_000_000_000)
+        config.load_vendor_database()
+        os.utime(self.index_file, ns=(2_000_000_000, 2_000_000_000))
+        self._reset()
+
+        # Another container uploads a new JSON; this container's index is now stale
+        self._write_vendors('New Vendor', 3_000_000_000)
+
+        self.assertEqual(config.lookup_vendor('00000C'), 'New Vendor')
+        self._reset()
+        self.assertEqual(config.lookup_vendor('00000C'), 'New Vendor')
+
+    def test_index_build_uses_unique_temp_file(self):
+        # A leftover from another builder must not be removed or reused
+        other_builder = self.index_file + '.tmp'
+        with open(other_builder, 'wb') as f:
+            f.write(b'in progress')
+        self._write_vendors('Cisco', 1_000_000_000)
+
+        config.load_vendor_database()
+
+        with open(other_builder, 'rb') as f:
+            self.assertEqual(f.read(), b'in progress')
+        leftovers = [name for name in os.listdir(self.tmpdir) if name.endswith('.tmp') and name != os.path.basename(other_builder)]
+        self.assertEqual(leftovers, [])
+        self.assertTrue(os.path.exists(self.index_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
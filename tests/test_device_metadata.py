@@ -0,0 +1,106 @@
+"""
+Tests for device_metadata edits: copy-on-write cache updates, synchronous
+saves (read-after-write) and propagation of save failures.
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+import device_metadata
+import encryption
+
+DEVICE_ID = '3f2b8c1e-4d5a-4e6f-8a9b-0c1d2e3f4a5b'
+MAC = 'AA:BB:CC:DD:EE:01'
+
+
+class DeviceMetadataEditTests(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        metadata_file = os.path.join(self._tmpdir.name, 'device_metadata.json')
+        key_file = os.path.join(self._tmpdir.name, 'encryption.key')
+        settings_file = os.path.join(self._tmpdir.name, 'settings.json')
+
+        for patcher in (mock.patch.object(device_metadata, 'METADATA_FILE', metadata_file),
+                        mock.patch.object(config, 'SETTINGS_FILE', settings_file),
+                        mock.patch.object(encryption, 'KEY_FILE', key_file)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        encryption.invalidate_cipher_cache()
+        self.addCleanup(encryption.invalidate_cipher_cache)
+        self._reset_cache()
+        self.addCleanup(self._reset_cache)
+
+    @staticmethod
+    def _reset_cache():
+        device_metadata._metadata_cache = None
+        device_metadata._cache_loaded = False
+
+    def test_update_is_on_disk_when_it_returns(self):
+        self.assertTrue(device_metadata.update_device_metadata(MAC, name='printer', device_id=DEVICE_ID))
+
+        # Nothing pending: a fresh read from disk already has the edit
+        reloaded = device_metadata.force_reload_metadata()
+        self.assertEqual(reloaded[DEVICE_ID][MAC.lower()]['name'], 'printer')
+
+    def test_read_after_write_sees_latest_edit(self):
+        device_metadata.update_device_metadata(MAC, name='first')
+        device_metadata.update_device_metadata(MAC, comment='note')
+        device_metadata.update_device_metadata(MAC, name='second')
+
+        self.assertEqual(device_metadata.get_device_metadata(MAC)['name'], 'second')
+        on_disk = device_metadata.load_metadata(use_cache=False)
+        self.assertEqual(on_disk[MAC.lower()], {'name': 'second', 'comment': 'note'})
+
+    def test_update_does_not_mutate_previous_cache(self):
+        device_metadata.update_device_metadata(MAC, name='old', device_id=DEVICE_ID)
+        before = device_metadata.load_metadata()
+        before_device = before[DEVICE_ID]
+        before_entry = before_device[MAC.lower()]
+
+        device_metadata.update_device_metadata(MAC, name='new', tags=['a'], device_id=DEVICE_ID)
+        device_metadata.update_device_metadata('aa:bb:cc:dd:ee:02', name='other', device_id=DEVICE_ID)
+
+        self.assertIsNot(device_metadata.load_metadata(), before)
+        self.assertEqual(before_entry, {'name': 'old'})
+        self.assertEqual(list(before_device), [MAC.lower()])
+
+    def test_delete_does_not_mutate_previous_cache(self):
+        device_metadata.update_device_metadata(MAC, name='gone')
+        before = device_metadata.load_metadata()
+
+        self.assertTrue(device_metadata.delete_device_metadata(MAC))
+
+        self.assertIn(MAC.lower(), before)
+        self.assertNotIn(MAC.lower(), device_metadata.load_metadata(use_cache=False))
+
+    def test_delete_missing_entry_is_noop(self):
+        self.assertTrue(device_metadata.delete_device_metadata(MAC, device_id=DEVICE_ID))
+
+    def test_failed_update_is_reported_and_not_kept(self):
+        device_metadata.update_device_metadata(MAC, name='saved')
+
+        with mock.patch.object(device_metadata, 'atomic_write_bytes', side_effect=OSError('disk full')):
+            self.assertFalse(device_metadata.update_device_metadata(MAC, name='lost'))
+
+        # The cache is dropped on failure, so readers see what is on disk
+        self.assertEqual(device_metadata.get_device_metadata(MAC)['name'], 'saved')
+
+    def test_failed_delete_is_reported_and_not_kept(self):
+        device_metadata.update_device_metadata(MAC, name='kept')
+
+        with mock.patch.object(device_metadata, 'atomic_write_bytes', side_effect=OSError('read-only')):
+            self.assertFalse(device_metadata.delete_device_metadata(MAC))
+
+        self.assertEqual(device_metadata.get_device_metadata(MAC)['name'], 'kept')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for encryption key caching and encrypted-value detection.
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.fernet import Fernet
+
+import config
+import encryption
+
+
+class KeyCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.key_file = os.path.join(tmpdir.name, 'encryption.key')
+
+        for patcher in (mock.patch.object(encryption, 'KEY_FILE', self.key_file),
+                        mock.patch.object(config, 'SETTINGS_FILE', os.path.join(tmpdir.name, 'settings.json'))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        encryption.invalidate_cipher_cache()
+        self.addCleanup(encryption.invalidate_cipher_cache)
+
+    def _replace_key(self, key):
+        st = os.stat(self.key_file)
+        with open(self.key_file, 'wb') as f:
+            f.write(key)
+        # Same size as before, so make sure the mtime moves
+        os.utime(self.key_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_key_is_generated_once_and_reused(self):
+        key = encryption.load_key()
+        self.assertIs(encryption.load_key(), key)
+        self.assertIs(encryption.get_cipher(), encryption.get_cipher())
+
+    def test_replaced_key_file_is_picked_up_without_invalidation(self):
+        old_cipher = encryption.get_cipher()
+        new_key = Fernet.generate_key()
+        self._replace_key(new_key)
+
+        self.assertEqual(encryption.load_key(), new_key)
+        self.assertIsNot(encryption.get_cipher(), old_cipher)
+
+        # Values written with the restored key decrypt in this process
+        token = Fernet(new_key).encrypt(b'secret')
+        self.assertEqual(encryption.get_cipher().decrypt(token), b'secret')
+
+
+
+class IsEncryptedTests(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        for patcher in (mock.patch.object(encryption, 'KEY_FILE', os.path.join(tmpdir.name, 'encryption.key')),
+                        mock.patch.object(config, 'SETTINGS_FILE', os.path.join(tmpdir.name, 'settings.json'))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        encryption.invalidate_cipher_cache()
+        self.addCleanup(encryption.invalidate_cipher_cache)
+
+    def test_encrypted_value(self):
+        self.assertTrue(encryption.is_encrypted(encryption.encrypt_string('api-key')))
+
+    def test_plain_values(self):
+        for value in ('api-key', '', None, 42, '$2b$12$' + 'a' * 53, 'Z0FBQUFB'):
+            with self.subTest(value=value):
+                self.assertFalse(encryption.is_encrypted(value))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for firewall_api_applications helpers.
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+import firewall_api_applications
+from firewall_api_applications import get_top_applications, is_private_ip
+
+FIREWALL_CONFIG = ('192.0.2.1', 'key', 'https://192.0.2.1/api/')
+JOB_RESPONSE = b'<response status="success"><result><job>7</job></result></response>'
+
+
+class IsPrivateIpTests(unittest.TestCase):
+
+    def test_private_ranges(self):
+        for ip in ('10.0.0.1', '10.255.255.255', '172.16.0.1', '172.31.255.254',
+                   '192.168.1.1', '127.0.0.1', '169.254.10.20'):
+            with self.subTest(ip=ip):
+                self.assertTrue(is_private_ip(ip))
+
+    def test_public_addresses(self):
+        for ip in ('8.8.8.8', '172.15.0.1', '172.32.0.1', '192.169.0.1', '11.0.0.1'):
+            with self.subTest(ip=ip):
+                self.assertFalse(is_private_ip(ip))
+
+    def test_malformed_input(self):
+        for ip in ('10.0.0.999', '10.a.b.c', '192.168.foo', '192.168.1', '10.0.0.1.5',
+                   '10.0.0.010', '10.0.0.0x1', '10.0.0.1 junk', '', 'N/A', None):
+            with self.subTest(ip=ip):
+                self.assertFalse(is_private_ip(ip))
+
+
+def _response(content, status_code=200):
+    return mock.Mock(status_code=status_code, content=content)
+
+
+def _log_result(apps, job_status):
+    entries = ''.join(f'<entry><app>{app}</app></entry>' for app in apps)
+    return (f'<response status="success"><result><job><status>{job_status}</status></job>'
+            f'<log><logs>{entries}</logs></log></result></response>').encode()
+
+
+class GetTopApplicationsPollingTests(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        for patcher in (mock.patch.object(firewall_api_applications.time, 'sleep'),
+                        mock.patch.object(config, 'SETTINGS_FILE', os.path.join(tmpdir.name, 'settings.json'))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, *poll_responses):
+        with mock.patch.object(firewall_api_applications, 'api_request_get',
+                               side_effect=[_response(JOB_RESPONSE), *poll_responses]) as request:
+            result = get_top_applications(FIREWALL_CONFIG)
+        return result, request
+
+    def test_polls_until_job_finishes(self):
+        result, request = self._run(
+            _response(_log_result(['dns'], 'ACT')),
+            _response(_log_result(['dns', 'ssl', 'dns'], 'FIN')),
+        )
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(result['apps'], [{'name': 'dns', 'count': 2}, {'name': 'ssl', 'count': 1}])
+
+    def test_request_timeout_is_time_left_before_deadline(self):
+        _, request = self._run(_response(_log_result(['dns'], 'FIN')))
+        timeout = request.call_args_list[1].kwargs['timeout']
+        self.assertLessEqual(timeout, firewall_api_applications.TOP_APPS_POLL_TIMEOUT)
+        self.assertGreater(timeout, firewall_api_applications.TOP_APPS_POLL_TIMEOUT - 1)
+
+    def test_stops_on_http_error(self):
+        result, request = self._run(
+            _response(_log_result(['dns'], 'ACT')),
+            _response(b'', status_code=500),
+        )
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(result['apps'], [{'name': 'dns', 'count': 1}])
+
+    def test_stops_on_error_response(self):
+        error = b'<response status="error"><msg><line>Invalid job</line></msg></response>'
+        result, request = self._run(_response(error))
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(result, {'apps': [], 'total_count': 0})
+
+    def test_gives_up_after_poll_window(self):
+        clock = iter(range(0, 100))
+        unfinished = [_response(_log_result(['dns'], 'ACT')) for _ in range(10)]
+        with mock.patch.object(firewall_api_applications.time, 'monotonic', side_effect=lambda: next(clock)):
+            result, request = self._run(*unfinished)
+        # Polling stops once the window has passed instead of running until the deadline
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(result['apps'], [{'name': 'dns', 'count': 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from logger import debug, info, warning, error, exception
-from device_manager import device_manager
+from device_manager import get_device_manager
 from firewall_api import get_throughput_data, get_firewall_config
 from firewall_api_logs import get_system_logs, get_threat_stats, get_traffic_logs
 from firewall_api_metrics import get_disk_usage
@@ -73,7 +73,7 @@ class ThroughputCollector:
 
         try:
             # Get all devices (load_devices returns a list directly)
-            devices = device_manager.load_devices()
+            devices = get_device_manager().load_devices()
 
             if not devices or len(devices) == 0:
                 debug("No devices configured, skipping collection")
@@ -1698,7 +1698,7 @@ class ThroughputCollector:
 
         try:
             # Get all devices
-            devices = device_manager.load_devices()
+            devices = get_device_manager().load_devices()
 
             if not devices or len(devices) == 0:
                 debug("No devices configured, skipping log collection")
@@ -1759,7 +1759,7 @@ class ThroughputCollector:
 
         try:
             # Get all devices
-            devices = device_manager.load_devices()
+            devices = get_device_manager().load_devices()
 
             if not devices or len(devices) == 0:
                 debug("No devices configured, skipping analytics collection")
@@ -1856,7 +1856,7 @@ class ThroughputCollector:
         debug(f"On-demand collection starting for device {device_id}")
 
         # Get device from device manager
-        device = device_manager.get_device(device_id)
+        device = get_device_manager().get_device(device_id)
 
         if not device:
             raise ValueError(f"Device {device_id} not found")
@@ -6,7 +6,10 @@ import requests
 import urllib3
 import time
 import socket
+import threading
+from http.cookiejar import DefaultCookiePolicy
 from functools import wraps
+from requests.adapters import HTTPAdapter
 from logger import debug, exception, warning
 
 # Disable SSL warnings for self-signed certificates
@@ -109,10 +112,30 @@ def retry_on_timeout(max_retries=3, backoff_factor=2, initial_delay=2):
         return wrapper
     return decorator
 
+# Shared keep-alive session so repeated calls to a firewall reuse its pooled TCP/TLS connection
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def _get_http_session():
+    """Create (once) and return the shared requests.Session used for firewall API requests"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                # One pool per firewall host, enough connections for concurrent dashboard fetches
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                # Stay stateless like requests.get: never carry cookies between calls
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _http_session = session
+    return _http_session
+
 def api_request_get(url, **kwargs):
-    """Wrapper for requests.get that tracks API calls"""
+    """Wrapper for requests.get that tracks API calls (uses the shared keep-alive session)"""
     increment_api_call()
-    return requests.get(url, **kwargs)
+    return _get_http_session().get(url, **kwargs)
 
 @retry_on_timeout(max_retries=3, backoff_factor=2, initial_delay=2)
 def api_request_post(firewall_ip, api_key, cmd, cmd_type='op'):
@@ -153,7 +176,7 @@ def api_request_post(firewall_ip, api_key, cmd, cmd_type='op'):
         debug(f"Making POST request to {url}")
 
         # Increased timeout from 30s to 60s for large operations
-        response = requests.post(url, data=params, verify=False, timeout=60)
+        response = _get_http_session().post(url, data=params, verify=False, timeout=60)
 
         elapsed = time.time() - start_time
         debug(f"Response received in {elapsed:.2f}s, status code: {response.status_code}")